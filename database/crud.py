@@ -3,11 +3,15 @@ CRUD operations for database models
 """
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, insert
 from datetime import datetime
 
 from .models import SalesLead, Company, LeadSource, ApifySyncState, LeadEvent
 
+# Most values bound in one IN (...) clause; stays under the 999-variable
+# limit of older SQLite builds
+IN_CLAUSE_CHUNK_SIZE = 900
+
 
 class LeadCRUD:
     """CRUD operations for SalesLead model"""
@@ -37,6 +41,30 @@ class LeadCRUD:
 
         return lead
 
+    @staticmethod
+    def bulk_create(session: Session, leads_data: List[Dict[str, Any]]) -> List[SalesLead]:
+        """Create many leads and their 'created' events with one flush each"""
+        leads = [SalesLead(**kwargs) for kwargs in leads_data]
+        session.add_all(leads)
+        session.flush()
+
+        # Events are never read back here, so insert them as plain rows
+        # (executemany) instead of building and tracking ORM objects
+        now = datetime.utcnow()
+        session.execute(insert(LeadEvent), [
+            {
+                'lead_id': lead.id,
+                'event_type': 'created',
+                'event_name': 'Lead Created',
+                'event_description': f'Lead {lead.full_name or lead.email} created',
+                'event_timestamp': now,
+                'actor': kwargs.get('created_by'),
+                'created_by': kwargs.get('created_by')
+            }
+            for lead, kwargs in zip(leads, leads_data)
+        ])
+        return leads
+
     @staticmethod
     def get_by_id(session: Session, lead_id: int, include_deleted: bool = False) -> Optional[SalesLead]:
         """Get lead by ID"""
@@ -47,12 +75,33 @@ class LeadCRUD:
 
     @staticmethod
     def get_by_email(session: Session, email: str, include_deleted: bool = False) -> Optional[SalesLead]:
-        """Get lead by email"""
-        query = session.query(SalesLead).filter(SalesLead.email == email)
+        """Get lead by email (case-insensitive)"""
+        query = session.query(SalesLead).filter(func.lower(SalesLead.email) == email.lower())
         if not include_deleted:
             query = query.filter(SalesLead.is_deleted == False)
         return query.first()
 
+    @staticmethod
+    def find_existing_emails(session: Session, emails: List[str], include_deleted: bool = False) -> set:
+        """
+        Return which of the given lowercased emails already belong to a lead
+
+        Only the matching rows are read (lower(email) IN (...), served by
+        idx_lead_email_lower), in chunks of IN_CLAUSE_CHUNK_SIZE emails.
+        """
+        emails = list(set(emails))
+        existing = set()
+
+        for start in range(0, len(emails), IN_CLAUSE_CHUNK_SIZE):
+            query = session.query(func.lower(SalesLead.email)).filter(
+                func.lower(SalesLead.email).in_(emails[start:start + IN_CLAUSE_CHUNK_SIZE])
+            )
+            if not include_deleted:
+                query = query.filter(SalesLead.is_deleted == False)
+            existing.update(email for (email,) in query)
+
+        return existing
+
     @staticmethod
     def get_by_external_id(session: Session, provider: str, external_id: str) -> Optional[SalesLead]:
         """Get lead by provider and external ID"""
@@ -208,6 +257,39 @@ class CompanyCRUD:
             company = CompanyCRUD.create(session, domain=domain, **kwargs)
         return company
 
+    @staticmethod
+    def get_or_create_many(session: Session, companies: Dict[str, Dict[str, Any]]) -> Dict[str, Company]:
+        """
+        Get or create companies for many domains at once
+
+        Args:
+            session: Database session
+            companies: Mapping of domain to fields used if the company is created
+
+        Returns:
+            Mapping of domain to Company (domains that couldn't be created are omitted)
+        """
+        if not companies:
+            return {}
+
+        existing = session.query(Company).filter(
+            and_(Company.domain.in_(list(companies)), Company.is_deleted == False)
+        ).all()
+        result = {company.domain: company for company in existing}
+
+        # Name is required, so domains without one are only looked up
+        missing = [
+            Company(domain=domain, **kwargs)
+            for domain, kwargs in companies.items()
+            if domain not in result and kwargs.get('name')
+        ]
+        if missing:
+            session.add_all(missing)
+            session.flush()
+            result.update((company.domain, company) for company in missing)
+
+        return result
+
     @staticmethod
     def update(session: Session, company_id: int, **kwargs) -> Optional[Company]:
         """Update a company"""
@@ -234,6 +316,36 @@ class LeadSourceCRUD:
         session.flush()
         return source
 
+    @staticmethod
+    def bulk_create(session: Session, sources_data: List[Dict[str, Any]]) -> int:
+        """
+        Insert many lead sources in one executemany, without loading them as objects
+
+        On PostgreSQL and SQLite, leads that already have a source are skipped
+        (ON CONFLICT (lead_id) DO NOTHING) instead of failing the batch.
+
+        Returns:
+            Number of sources submitted
+        """
+        if not sources_data:
+            return 0
+
+        dialect = session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            dialect_insert = None
+
+        if dialect_insert is not None:
+            stmt = dialect_insert(LeadSource).on_conflict_do_nothing(index_elements=['lead_id'])
+        else:
+            stmt = insert(LeadSource)
+
+        session.execute(stmt, sources_data)
+        return len(sources_data)
+
     @staticmethod
     def get_by_lead_id(session: Session, lead_id: int) -> Optional[LeadSource]:
         """Get source by lead ID"""
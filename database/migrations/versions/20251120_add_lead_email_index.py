@@ -0,0 +1,33 @@
+"""Add case-insensitive email index for lead deduplication
+
+Revision ID: 20251120_lead_email_index
+Revises: 20251118_provider_fields
+Create Date: 2025-11-20 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20251120_lead_email_index'
+down_revision = '20251118_provider_fields'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Functional index backing LeadCRUD.get_by_email's lower(email) lookup.
+    # Built CONCURRENTLY on PostgreSQL so imports are not blocked; other dialects ignore the flag.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_lead_email_lower',
+            'sales_leads',
+            [sa.text('lower(email)')],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_lead_email_lower', table_name='sales_leads', postgresql_concurrently=True)
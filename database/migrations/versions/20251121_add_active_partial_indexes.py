@@ -0,0 +1,47 @@
+"""Add partial indexes for active-row lists and per-campaign queue lookups
+
+Revision ID: 20251121_active_partial_indexes
+Revises: 20251120_lead_email_index
+Create Date: 2025-11-21 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20251121_active_partial_indexes'
+down_revision = '20251120_lead_email_index'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) -- all restricted to rows that are not soft-deleted
+PARTIAL_INDEXES = [
+    ('idx_campaign_active_created', 'email_campaigns', ['created_at']),
+    ('idx_template_active_created', 'email_templates', ['created_at']),
+    ('idx_lead_active_created', 'sales_leads', ['created_at']),
+    ('idx_queue_campaign_status_scheduled', 'email_queue', ['campaign_id', 'status', 'scheduled_at']),
+]
+
+
+def upgrade() -> None:
+    # Only rows with is_deleted = false are indexed, matching the filters used by the web UI.
+    # Built CONCURRENTLY on PostgreSQL so writes are not blocked; other dialects ignore the flag.
+    active = sa.column('is_deleted') == sa.false()
+    with op.get_context().autocommit_block():
+        for name, table, columns in PARTIAL_INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=active,
+                sqlite_where=active,
+                postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(PARTIAL_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
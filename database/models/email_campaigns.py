@@ -87,3 +87,8 @@ class EmailCampaign(BaseModel):
 
 # Indexes
 Index('idx_campaign_status_scheduled', EmailCampaign.status, EmailCampaign.scheduled_at)
+Index(
+    'idx_campaign_active_created', EmailCampaign.created_at,
+    postgresql_where=(EmailCampaign.is_deleted == False),
+    sqlite_where=(EmailCampaign.is_deleted == False)
+)  # Newest-first campaign lists
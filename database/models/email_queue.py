@@ -89,3 +89,8 @@ Index('idx_queue_status_scheduled', EmailQueue.status, EmailQueue.scheduled_at)
 Index('idx_queue_campaign_status', EmailQueue.campaign_id, EmailQueue.status)
 Index('idx_queue_lead', EmailQueue.lead_id)
 Index('idx_queue_provider_message', EmailQueue.provider_message_id)
+Index(
+    'idx_queue_campaign_status_scheduled', EmailQueue.campaign_id, EmailQueue.status, EmailQueue.scheduled_at,
+    postgresql_where=(EmailQueue.is_deleted == False),
+    sqlite_where=(EmailQueue.is_deleted == False)
+)  # Per-campaign due-email lookup in send_campaign_emails
@@ -1,10 +1,40 @@
 """
 Email Template models
 """
+import re
+from functools import lru_cache
+
 from sqlalchemy import Column, String, Text, Integer, JSON, Boolean, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
+_PLACEHOLDER_RE = re.compile(r'\{\{([^{}]*)\}\}')
+
+
+@lru_cache(maxsize=1024)
+def _split_placeholders(source: str) -> tuple:
+    """
+    Split template text into alternating literal text and placeholder names
+
+    Even positions are literal text, odd positions are the names inside
+    {{...}}. Keyed on the text itself, so an edited template is simply a new
+    cache entry.
+    """
+    return tuple(_PLACEHOLDER_RE.split(source))
+
+
+def _substitute(source: str, values: dict) -> str:
+    """Fill {{name}} placeholders from values; unknown names are left as-is"""
+    parts = _split_placeholders(source)
+    if len(parts) == 1:
+        return source
+
+    out = list(parts)
+    for i in range(1, len(out), 2):
+        name = out[i]
+        out[i] = values[name] if name in values else f"{{{{{name}}}}}"
+    return ''.join(out)
+
 
 class EmailTemplate(BaseModel):
     """
@@ -56,20 +86,20 @@ class EmailTemplate(BaseModel):
         Returns:
             Tuple of (subject, body_html, body_text)
         """
-        subject = self.subject
-        body_html = self.body_html or self.body_text
-        body_text = self.body_text
-
-        # Simple variable substitution
-        for key, value in variables.items():
-            placeholder = f"{{{{{key}}}}}"
-            subject = subject.replace(placeholder, str(value))
-            if body_html:
-                body_html = body_html.replace(placeholder, str(value))
-            body_text = body_text.replace(placeholder, str(value))
+        # Simple variable substitution; each text is parsed once and cached
+        values = {key: str(value) for key, value in variables.items()}
+
+        subject = _substitute(self.subject, values)
+        body_text = _substitute(self.body_text, values)
+        body_html = _substitute(self.body_html, values) if self.body_html else body_text
 
         return subject, body_html, body_text
 
 
 # Indexes
 Index('idx_template_type_active', EmailTemplate.template_type, EmailTemplate.is_active)
+Index(
+    'idx_template_active_created', EmailTemplate.created_at,
+    postgresql_where=(EmailTemplate.is_deleted == False),
+    sqlite_where=(EmailTemplate.is_deleted == False)
+)  # Newest-first template list
@@ -1,7 +1,7 @@
 """
 Sales Lead model
 """
-from sqlalchemy import Column, String, Text, Integer, ForeignKey, Index, JSON
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, Index, JSON, func
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
@@ -80,3 +80,9 @@ Index('idx_lead_source_actor', SalesLead.source, SalesLead.actor_id)
 Index('idx_lead_location', SalesLead.country, SalesLead.city)
 Index('idx_lead_status', SalesLead.lead_status, SalesLead.enrichment_status)
 Index('idx_lead_company', SalesLead.company_id, SalesLead.lead_status)
+Index('idx_lead_email_lower', func.lower(SalesLead.email))  # Case-insensitive dedup lookups
+Index(
+    'idx_lead_active_created', SalesLead.created_at,
+    postgresql_where=(SalesLead.is_deleted == False),
+    sqlite_where=(SalesLead.is_deleted == False)
+)  # Newest-first lead list and active-lead counts
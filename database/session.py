@@ -4,14 +4,23 @@ Database session management
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
 from contextlib import contextmanager
-from .config import DATABASE_URL
+from .config import DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW
+
+# Pool sizing only applies to server databases; SQLite keeps its default pool
+_pool_options = {}
+if not DATABASE_URL.startswith('sqlite'):
+    _pool_options = {
+        'pool_size': DB_POOL_SIZE,  # Connections kept open for concurrent requests
+        'max_overflow': DB_MAX_OVERFLOW  # Extra connections allowed during bursts
+    }
 
 # Create engine
 engine = create_engine(
     DATABASE_URL,
     echo=False,  # Set to True for SQL query logging
     pool_pre_ping=True,  # Verify connections before using
-    pool_recycle=3600  # Recycle connections after 1 hour
+    pool_recycle=3600,  # Recycle connections after 1 hour
+    **_pool_options
 )
 
 # Create session factory
@@ -5,7 +5,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from sqlalchemy import and_, desc, insert
 
 import sys
 from pathlib import Path
@@ -255,24 +255,27 @@ class CampaignManager:
 
         scheduled_at = scheduled_at or datetime.utcnow()
 
-        queued_count = 0
+        # Leads already queued for this campaign, fetched in one query
+        already_queued = {
+            lead_id for (lead_id,) in self.session.query(EmailQueue.lead_id).filter(
+                and_(
+                    EmailQueue.campaign_id == campaign_id,
+                    EmailQueue.status.in_(['pending', 'sent'])
+                )
+            )
+        }
+
+        queue_rows = []
 
         for lead in leads:
             if not lead.email:
                 continue
 
             # Check if already queued for this campaign
-            existing = self.session.query(EmailQueue).filter(
-                and_(
-                    EmailQueue.campaign_id == campaign_id,
-                    EmailQueue.lead_id == lead.id,
-                    EmailQueue.status.in_(['pending', 'sent'])
-                )
-            ).first()
-
-            if existing:
+            if lead.id in already_queued:
                 logger.debug(f"Lead {lead.id} already queued for campaign {campaign_id}")
                 continue
+            already_queued.add(lead.id)
 
             # Prepare template variables
             variables = {
@@ -290,7 +293,8 @@ class CampaignManager:
             subject, body_html, body_text = campaign.template.render(variables)
 
             # Create queue item
-            email = EmailQueue(
+            now = datetime.utcnow()
+            queue_rows.append(dict(
                 campaign_id=campaign_id,
                 lead_id=lead.id,
                 recipient_email=lead.email,
@@ -304,12 +308,14 @@ class CampaignManager:
                 email_type='initial',
                 variables=variables,
                 attachments=campaign.attachments,  # Copy attachments from campaign
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-
-            self.session.add(email)
-            queued_count += 1
+                created_at=now,
+                updated_at=now
+            ))
+
+        # Insert all queue items in one executemany
+        if queue_rows:
+            self.session.execute(insert(EmailQueue), queue_rows)
+        queued_count = len(queue_rows)
 
         # Update campaign
         campaign.total_recipients = queued_count
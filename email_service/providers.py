@@ -1,19 +1,69 @@
 """
 Email service providers (SMTP, SendGrid, AWS SES, etc.)
 """
+import base64
+import hashlib
 import smtplib
+from collections import OrderedDict
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
-from email import encoders
 from email.utils import formataddr
 from pathlib import Path
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Tuple
 import logging
 import os
+import threading
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Most SMTP providers (one per server and account) kept open at once; the least
+# recently used is closed first
+MAX_SMTP_PROVIDERS = 32
+
+# Attachment files read per chunk while base64-encoding; a multiple of 57 so
+# every chunk encodes to whole 76-character lines
+ATTACHMENT_CHUNK_SIZE = 57 * 16 * 1024
+
+# Most encoded attachments kept for reuse; least recently used are dropped first
+MAX_CACHED_ATTACHMENTS = 16
+
+# (resolved path, st_mtime_ns, st_size) -> base64 payload
+_ATTACHMENT_CACHE: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_ATTACHMENT_LOCK = threading.Lock()
+
+
+def _encoded_attachment(filepath: Path) -> str:
+    """
+    Base64 payload of an attachment file, reused while the file is unchanged
+
+    A campaign attaches the same files to every email, so each file is read
+    and encoded once rather than once per recipient. The file is streamed in
+    ATTACHMENT_CHUNK_SIZE pieces, so only the encoded text is held in memory.
+    """
+    stat = filepath.stat()
+    key = (str(filepath.resolve()), stat.st_mtime_ns, stat.st_size)
+
+    with _ATTACHMENT_LOCK:
+        encoded = _ATTACHMENT_CACHE.get(key)
+        if encoded is not None:
+            _ATTACHMENT_CACHE.move_to_end(key)
+            return encoded
+
+    with open(filepath, 'rb') as f:
+        encoded = ''.join(
+            base64.encodebytes(chunk).decode('ascii')
+            for chunk in iter(lambda: f.read(ATTACHMENT_CHUNK_SIZE), b'')
+        )
+
+    with _ATTACHMENT_LOCK:
+        _ATTACHMENT_CACHE[key] = encoded
+        while len(_ATTACHMENT_CACHE) > MAX_CACHED_ATTACHMENTS:
+            _ATTACHMENT_CACHE.popitem(last=False)
+
+    return encoded
+
 
 class EmailProvider:
     """Base class for email providers"""
@@ -27,6 +77,10 @@ class EmailProvider:
         """
         raise NotImplementedError
 
+    def close(self):
+        """Release any open connection held by the provider"""
+        pass
+
 
 class SMTPProvider(EmailProvider):
     """SMTP email provider"""
@@ -45,6 +99,56 @@ class SMTPProvider(EmailProvider):
         self.password = password or os.getenv('SMTP_PASSWORD')
         self.use_tls = use_tls
 
+        # One connection is kept open and reused by every send() call
+        self._server = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection"""
+        if self.use_tls:
+            server = smtplib.SMTP(self.host, self.port)
+            server.starttls()
+        else:
+            server = smtplib.SMTP_SSL(self.host, self.port)
+
+        if self.username and self.password:
+            server.login(self.username, self.password)
+
+        return server
+
+    def _get_server(self) -> smtplib.SMTP:
+        """
+        Return the open connection, reconnecting if it is missing or no longer answers
+
+        A reused connection is checked with NOOP first, so a connection the
+        server has closed is replaced before a message is sent on it.
+        """
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] != 250:
+                    self._drop_server()
+            except (smtplib.SMTPException, OSError):
+                self._drop_server()
+
+        if self._server is None:
+            self._server = self._connect()
+
+        return self._server
+
+    def _drop_server(self):
+        """Close the current connection, ignoring errors from a dead socket"""
+        server, self._server = self._server, None
+        if server is not None:
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+
+    def close(self):
+        """Close the SMTP connection"""
+        with self._lock:
+            self._drop_server()
+
     def send(
         self,
         to_email: str,
@@ -91,28 +195,23 @@ class SMTPProvider(EmailProvider):
                 for attachment in attachments:
                     filepath = Path(attachment.get('path', attachment.get('filename', '')))
                     if filepath.exists():
-                        with open(filepath, 'rb') as f:
-                            part = MIMEBase('application', 'octet-stream')
-                            part.set_payload(f.read())
-                            encoders.encode_base64(part)
-                            part.add_header(
-                                'Content-Disposition',
-                                f'attachment; filename= {filepath.name}'
-                            )
-                            msg.attach(part)
-
-            # Connect and send
-            if self.use_tls:
-                server = smtplib.SMTP(self.host, self.port)
-                server.starttls()
-            else:
-                server = smtplib.SMTP_SSL(self.host, self.port)
-
-            if self.username and self.password:
-                server.login(self.username, self.password)
-
-            server.send_message(msg)
-            server.quit()
+                        part = MIMEBase('application', 'octet-stream')
+                        part.set_payload(_encoded_attachment(filepath))
+                        part['Content-Transfer-Encoding'] = 'base64'
+                        part.add_header(
+                            'Content-Disposition',
+                            f"attachment; filename= {attachment.get('filename') or filepath.name}"
+                        )
+                        msg.attach(part)
+
+            # Send over the shared connection, once: a failure after the
+            # transaction started may mean the server already accepted it
+            with self._lock:
+                try:
+                    self._get_server().send_message(msg)
+                except Exception:
+                    self._drop_server()
+                    raise
 
             logger.info(f"Email sent successfully to {to_email}")
 
@@ -269,9 +368,49 @@ class AWSProvider(EmailProvider):
             }
 
 
+# (host, port, username, sha256 of password) -> provider
+_SMTP_PROVIDERS: "OrderedDict[Tuple[str, int, Optional[str], str], SMTPProvider]" = OrderedDict()
+_SMTP_PROVIDERS_LOCK = threading.Lock()
+
+
+def get_smtp_provider(
+    host: str,
+    port: int,
+    username: Optional[str],
+    password: Optional[str]
+) -> SMTPProvider:
+    """
+    Get a shared SMTPProvider for one server and account
+
+    The provider (and its open connection) is reused by every caller with the
+    same settings, so repeated batches don't repeat the TCP/TLS handshake.
+    Providers are keyed on a hash of the password, and the least recently
+    used one is closed once more than MAX_SMTP_PROVIDERS are open.
+    """
+    key = (host, port, username, hashlib.sha256((password or '').encode()).hexdigest())
+    evicted = []
+
+    with _SMTP_PROVIDERS_LOCK:
+        provider = _SMTP_PROVIDERS.get(key)
+        if provider is None:
+            provider = _SMTP_PROVIDERS[key] = SMTPProvider(
+                host=host, port=port, username=username, password=password
+            )
+            while len(_SMTP_PROVIDERS) > MAX_SMTP_PROVIDERS:
+                evicted.append(_SMTP_PROVIDERS.popitem(last=False)[1])
+        else:
+            _SMTP_PROVIDERS.move_to_end(key)
+
+    for old_provider in evicted:
+        old_provider.close()
+
+    return provider
+
+
+@lru_cache(maxsize=None)
 def get_provider(provider_type: str = 'smtp') -> EmailProvider:
     """
-    Get email provider instance
+    Get the shared email provider instance, configured from the environment
 
     Args:
         provider_type: 'smtp', 'sendgrid', or 'aws_ses'
@@ -4,9 +4,9 @@ Email queue processor - processes pending emails from the queue
 import time
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, update
 
 import sys
 from pathlib import Path
@@ -63,13 +63,21 @@ class QueueProcessor:
 
         return self.emails_sent_this_hour < self.rate_limit
 
-    def send_email(self, email: EmailQueue) -> bool:
-        """Send a single email"""
+    def send_email(self, email: EmailQueue, commit: bool = True) -> bool:
+        """
+        Send a single email
+
+        Args:
+            email: Queue item to send
+            commit: Commit status changes as they happen; pass False to leave
+                the commit to the caller (see send_batch)
+        """
 
         try:
             # Mark as sending
             email.status = 'sending'
-            self.session.commit()
+            if commit:
+                self.session.commit()
 
             # Send via provider
             result = self.provider.send(
@@ -103,7 +111,8 @@ class QueueProcessor:
                     updated_at=datetime.utcnow()
                 )
                 self.session.add(tracking)
-                self.session.commit()
+                if commit:
+                    self.session.commit()
 
                 logger.info(f"Sent email {email.id} to {email.recipient_email}")
 
@@ -118,7 +127,8 @@ class QueueProcessor:
                 if email.campaign:
                     email.campaign.emails_failed += 1
 
-                self.session.commit()
+                if commit:
+                    self.session.commit()
 
                 logger.error(f"Failed to send email {email.id}: {result.get('error')}")
                 return False
@@ -129,11 +139,81 @@ class QueueProcessor:
             if email.campaign:
                 email.campaign.emails_failed += 1
 
-            self.session.commit()
+            if commit:
+                self.session.commit()
 
             logger.error(f"Exception sending email {email.id}: {e}")
             return False
 
+    def claim_emails(self, emails: List[EmailQueue]) -> List[EmailQueue]:
+        """
+        Mark pending emails as 'sending' and commit, before any is sent
+
+        Only rows still 'pending' are claimed, so a concurrent sender that
+        loaded the same rows gets none of them. Claimed rows that are never
+        resolved (e.g. the process is killed mid-batch) stay 'sending' rather
+        than going out again on the next run.
+
+        Returns:
+            The emails this call claimed, in their original order
+        """
+        ids = [email.id for email in emails]
+        if not ids:
+            return []
+
+        claim = update(EmailQueue).where(
+            EmailQueue.status == 'pending'
+        ).values(status='sending', updated_at=datetime.utcnow())
+
+        if self.session.get_bind().dialect.update_returning:
+            claimed_ids = set(self.session.execute(
+                claim.where(EmailQueue.id.in_(ids)).returning(EmailQueue.id),
+                execution_options={'synchronize_session': False}
+            ).scalars())
+        else:
+            # No UPDATE ... RETURNING (e.g. MySQL): claim row by row, still one commit
+            claimed_ids = {
+                email_id for email_id in ids
+                if self.session.execute(
+                    claim.where(EmailQueue.id == email_id),
+                    execution_options={'synchronize_session': False}
+                ).rowcount
+            }
+
+        self.session.commit()
+
+        return [email for email in emails if email.id in claimed_ids]
+
+    def send_batch(self, emails: List[EmailQueue]) -> Tuple[int, int]:
+        """
+        Claim emails, send them, and commit their results in one transaction
+
+        The batch is claimed first (see claim_emails), so emails another sender
+        already took are skipped. Queue statuses, campaign counters and
+        tracking rows are then written by a single commit at the end instead
+        of two commits per email. The commit also runs if the loop is
+        interrupted, so emails already handed to the provider are recorded.
+
+        Returns:
+            Tuple of (sent_count, failed_count)
+        """
+
+        sent_count = 0
+        failed_count = 0
+
+        claimed = self.claim_emails(emails)
+
+        try:
+            for email in claimed:
+                if self.send_email(email, commit=False):
+                    sent_count += 1
+                else:
+                    failed_count += 1
+        finally:
+            self.session.commit()
+
+        return sent_count, failed_count
+
     def process_batch(self) -> int:
         """Process a batch of pending emails"""
 
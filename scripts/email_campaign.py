@@ -6,6 +6,7 @@ import sys
 import argparse
 from pathlib import Path
 from datetime import datetime
+from contextlib import contextmanager
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -14,9 +15,19 @@ from database.session import session_scope
 from email_service.campaign_manager import CampaignManager
 
 
-def create_template(args):
+@contextmanager
+def _session_or_scope(session=None):
+    """Reuse the caller's session, or open a transactional scope for one-shot use"""
+    if session is not None:
+        yield session
+    else:
+        with session_scope() as new_session:
+            yield new_session
+
+
+def create_template(args, session=None):
     """Create an email template"""
-    with session_scope() as session:
+    with _session_or_scope(session) as session:
         manager = CampaignManager(session=session)
 
         template = manager.create_template(
@@ -30,9 +41,9 @@ def create_template(args):
         print(f"✓ Template created: ID={template.id}, Name={template.name}")
 
 
-def create_campaign(args):
+def create_campaign(args, session=None):
     """Create an email campaign"""
-    with session_scope() as session:
+    with _session_or_scope(session) as session:
         manager = CampaignManager(session=session)
 
         # Parse filters if provided
@@ -59,9 +70,9 @@ def create_campaign(args):
         print(f"✓ Campaign created: ID={campaign.id}, Name={campaign.name}")
 
 
-def queue_campaign(args):
+def queue_campaign(args, session=None):
     """Queue emails for a campaign"""
-    with session_scope() as session:
+    with _session_or_scope(session) as session:
         manager = CampaignManager(session=session)
 
         if args.from_latest_run:
@@ -79,9 +90,9 @@ def queue_campaign(args):
         print(f"✓ Queued {count} emails for campaign {args.campaign_id}")
 
 
-def schedule_follow_ups(args):
+def schedule_follow_ups(args, session=None):
     """Schedule follow-up emails"""
-    with session_scope() as session:
+    with _session_or_scope(session) as session:
         manager = CampaignManager(session=session)
 
         count = manager.schedule_follow_ups(args.campaign_id)
@@ -89,9 +100,9 @@ def schedule_follow_ups(args):
         print(f"✓ Scheduled {count} follow-up emails")
 
 
-def show_stats(args):
+def show_stats(args, session=None):
     """Show campaign statistics"""
-    with session_scope() as session:
+    with _session_or_scope(session) as session:
         manager = CampaignManager(session=session)
 
         stats = manager.get_campaign_stats(args.campaign_id)
@@ -189,7 +200,9 @@ def main():
 
     command_func = commands.get(args.command)
     if command_func:
-        command_func(args)
+        # One session for the whole invocation so multi-step commands share a connection
+        with session_scope() as session:
+            command_func(args, session=session)
 
 
 if __name__ == '__main__':
@@ -23,6 +23,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of imported leads between intermediate commits
+COMMIT_BATCH_SIZE = 5000
+
+# Apify result keys to try, in priority order, for each lead field
+FIELD_PRIORITIES = {
+    'phone': ('phone', 'phoneNumber', 'telephone'),
+    'company_name': ('organizationName', 'companyName', 'company'),
+    'company_domain': ('organizationWebsite', 'domain', 'website'),
+    'city': ('organizationCity', 'city', 'location'),
+    'country': ('organizationCountry', 'country'),
+    'state': ('organizationState', 'state'),
+    'industry': ('organizationIndustry', 'industry', 'industries'),
+    'title': ('position', 'title'),
+    'external_id': ('linkedinUrl', 'id', 'externalId'),
+}
+
+
+# Shared DataManager for file imports, created on first use so importing
+# this module doesn't create the exports directory as a side effect
+_DATA_MANAGER: Optional[DataManager] = None
+
+
+def _get_data_manager() -> DataManager:
+    """Return the module-wide DataManager, creating it on first call"""
+    global _DATA_MANAGER
+    if _DATA_MANAGER is None:
+        _DATA_MANAGER = DataManager()
+    return _DATA_MANAGER
+
+
+def first(d: Dict[str, Any], *keys: str) -> Any:
+    """Return the first truthy value found in d for the given keys"""
+    for key in keys:
+        value = d.get(key)
+        if value:
+            return value
+    return None
+
 
 def parse_datetime(date_str: Optional[str]) -> Optional[datetime]:
     """Parse ISO datetime string to Python datetime object"""
@@ -59,6 +97,29 @@ def normalize_name(full_name: Optional[str]) -> tuple[Optional[str], Optional[st
     return parts[0], parts[1]
 
 
+def extract_lead_keys(result: Dict[str, Any]) -> tuple[Optional[str], Optional[str]]:
+    """
+    Extract the dedup keys from an Apify result without mapping the full record
+    
+    Args:
+        result: Apify result record
+        
+    Returns:
+        Tuple of (email, external_id), or (None, None) for invalid records
+    """
+    # Skip invalid records (like log messages) and records without email
+    if not isinstance(result, dict):
+        return None, None
+    
+    email = result.get('email')
+    if not email:
+        return None, None
+    
+    # Use LinkedIn URL or email as fallback
+    external_id = first(result, *FIELD_PRIORITIES['external_id']) or email
+    return email, external_id
+
+
 def map_apify_result_to_lead(result: Dict[str, Any], run_data: Dict[str, Any], actor_id: str) -> Dict[str, Any]:
     """
     Map Apify result to SalesLead fields
@@ -71,10 +132,33 @@ def map_apify_result_to_lead(result: Dict[str, Any], run_data: Dict[str, Any], a
     Returns:
         Dictionary with lead fields
     """
-    # Skip invalid records (like log messages)
-    if not isinstance(result, dict) or not result.get('email'):
+    email, external_id = extract_lead_keys(result)
+    if not email:
         return None
     
+    return build_lead_data(result, run_data, actor_id, email, external_id)
+
+
+def build_lead_data(
+    result: Dict[str, Any],
+    run_data: Dict[str, Any],
+    actor_id: str,
+    email: str,
+    external_id: str
+) -> Dict[str, Any]:
+    """
+    Build SalesLead fields for a record whose keys were already extracted
+    
+    Args:
+        result: Apify result record
+        run_data: Apify run metadata
+        actor_id: Apify actor ID
+        email: Lead email from extract_lead_keys
+        external_id: Lead external ID from extract_lead_keys
+        
+    Returns:
+        Dictionary with lead fields
+    """
     # Extract name - handle both firstName/lastName and fullName
     first_name = result.get('firstName')
     last_name = result.get('lastName')
@@ -86,53 +170,40 @@ def map_apify_result_to_lead(result: Dict[str, Any], run_data: Dict[str, Any], a
     if not first_name and not last_name and full_name:
         first_name, last_name = normalize_name(full_name)
     
-    # Extract email
-    email = result.get('email')
-    if not email:
-        return None  # Skip records without email
-    
-    email_verified = None
-    if email:
-        # Check if email is verified (Apify sometimes includes this)
-        if result.get('emailVerified') or result.get('verified'):
-            email_verified = 'verified'
-        elif result.get('riskyEmail'):
-            email_verified = 'risky'
-        else:
-            email_verified = 'unknown'
+    # Check if email is verified (Apify sometimes includes this)
+    if first(result, 'emailVerified', 'verified'):
+        email_verified = 'verified'
+    elif result.get('riskyEmail'):
+        email_verified = 'risky'
+    else:
+        email_verified = 'unknown'
     
     # Extract phone
-    phone = result.get('phone') or result.get('phoneNumber') or result.get('telephone')
+    phone = first(result, *FIELD_PRIORITIES['phone'])
     
     # Extract company info - handle organizationName, organizationWebsite
-    company_name = result.get('organizationName') or result.get('companyName') or result.get('company')
-    company_domain = result.get('organizationWebsite') or result.get('domain') or result.get('website')
+    company_name = first(result, *FIELD_PRIORITIES['company_name'])
+    company_domain = first(result, *FIELD_PRIORITIES['company_domain'])
     
     # Clean up domain
     if company_domain:
         # Remove http://, https://, www.
         company_domain = company_domain.replace('https://', '').replace('http://', '').replace('www.', '')
-        # Remove trailing slash
-        company_domain = company_domain.rstrip('/')
-        # Extract domain from full URL if needed
-        if '/' in company_domain:
-            company_domain = company_domain.split('/')[0]
+        # Drop any path or trailing slash
+        company_domain = company_domain.partition('/')[0]
     
     # Extract location - handle organizationCity, organizationCountry
-    city = result.get('organizationCity') or result.get('city') or result.get('location')
-    country = result.get('organizationCountry') or result.get('country')
-    state = result.get('organizationState') or result.get('state')
+    city = first(result, *FIELD_PRIORITIES['city'])
+    country = first(result, *FIELD_PRIORITIES['country'])
+    state = first(result, *FIELD_PRIORITIES['state'])
     
     # Extract industry
-    industry = result.get('organizationIndustry') or result.get('industry') or result.get('industries')
+    industry = first(result, *FIELD_PRIORITIES['industry'])
     if isinstance(industry, list):
         industry = industry[0] if industry else None
     
     # Extract position/title
-    title = result.get('position') or result.get('title')
-    
-    # Extract external ID - use LinkedIn URL or email as fallback
-    external_id = result.get('linkedinUrl') or result.get('id') or result.get('externalId') or email
+    title = first(result, *FIELD_PRIORITIES['title'])
     
     # Build lead data
     lead_data = {
@@ -189,6 +260,8 @@ def import_leads_to_database(
     }
     
     run_id = run_data.get('id')
+    dataset_id = run_data.get('defaultDatasetId')
+    resolved_actor_name = actor_name or f'Actor {actor_id}'
     
     with session_scope() as session:
         # Create or update sync state
@@ -201,9 +274,9 @@ def import_leads_to_database(
             sync_state = ApifySyncCRUD.create(
                 session=session,
                 actor_id=actor_id,
-                actor_name=actor_name or f'Actor {actor_id}',
+                actor_name=resolved_actor_name,
                 run_id=run_id,
-                dataset_id=run_data.get('defaultDatasetId'),
+                dataset_id=dataset_id,
                 run_status=run_data.get('status'),
                 started_at=started_at,
                 finished_at=finished_at,
@@ -218,32 +291,34 @@ def import_leads_to_database(
         # Import each result
         for result in results:
             try:
-                # Map result to lead data
-                lead_data = map_apify_result_to_lead(result, run_data, actor_id)
+                # Extract dedup keys only; full mapping waits until the
+                # record is known not to be a duplicate
+                email, external_id = extract_lead_keys(result)
                 
                 # Skip invalid records
-                if not lead_data or not lead_data.get('email'):
+                if not email:
                     stats['skipped'] += 1
                     continue
                 
                 # Check if lead already exists (by email or external_id)
-                existing_lead = None
-                if lead_data.get('email'):
-                    existing_lead = LeadCRUD.get_by_email(session, lead_data['email'])
+                existing_lead = LeadCRUD.get_by_email(session, email)
                 
-                if not existing_lead and lead_data.get('external_id'):
+                if not existing_lead and external_id:
                     existing_lead = LeadCRUD.get_by_external_id(
                         session,
                         'apify',
-                        lead_data['external_id']
+                        external_id
                     )
                 
                 if existing_lead:
                     # Skip duplicate
                     stats['skipped'] += 1
-                    logger.debug(f"Skipping duplicate lead: {lead_data.get('email') or lead_data.get('external_id')}")
+                    logger.debug("Skipping duplicate lead: %s", email)
                     continue
                 
+                # Map result to lead data
+                lead_data = build_lead_data(result, run_data, actor_id, email, external_id)
+                
                 # Create company if needed
                 company_id = None
                 if lead_data.get('company_domain'):
@@ -269,12 +344,12 @@ def import_leads_to_database(
                     session=session,
                     lead_id=lead.id,
                     source_type='apify',
-                    source_name=actor_name or f'Actor {actor_id}',
+                    source_name=resolved_actor_name,
                     provider_name='apify',
                     actor_id=actor_id,
                     actor_name=actor_name,
                     run_id=run_id,
-                    dataset_id=run_data.get('defaultDatasetId'),
+                    dataset_id=dataset_id,
                     external_id=lead_data.get('external_id'),
                     scrape_params=scrape_params
                 )
@@ -283,8 +358,15 @@ def import_leads_to_database(
                 
             except Exception as e:
                 stats['errors'] += 1
-                logger.error(f"Error importing lead: {e}")
-                logger.debug(f"Result data: {result}")
+                logger.error("Error importing lead: %s", e)
+                logger.debug("Result data: %s", result)
+            
+            else:
+                # Commit periodically so large runs don't build one huge transaction.
+                # Outside the try: a failed commit aborts the import (session_scope
+                # rolls back) rather than counting as a single record error
+                if stats['imported'] % COMMIT_BATCH_SIZE == 0:
+                    session.commit()
         
         # Update sync state
         sync_state.mark_completed(
@@ -310,8 +392,7 @@ def import_from_file(filepath: str, actor_id: str, actor_name: Optional[str] = N
     Returns:
         Dictionary with import statistics
     """
-    data_manager = DataManager()
-    results = data_manager.load_json(filepath)
+    results = _get_data_manager().load_json(filepath)
     
     # Create mock run_data for file imports
     run_data = {
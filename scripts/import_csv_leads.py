@@ -3,41 +3,128 @@
 Import leads from CSV file
 """
 import csv
+import io
+import re
 import sys
+import traceback
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 import logging
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from database.session import get_session
 from database.crud import LeadCRUD, LeadSourceCRUD, CompanyCRUD
-from database.models.lead_sources import LeadSource
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Number of leads inserted and committed together
+BATCH_SIZE = 1000
+
+# Read buffer for CSV files and how much of the start is used to detect the delimiter
+READ_BUFFER_SIZE = 1 << 20
+SNIFF_SAMPLE_SIZE = 64 * 1024
+
+# Scheme and www. prefix stripped from company domains
+DOMAIN_PREFIX_RE = re.compile(r'^(?:https?://)?(?:www\.)?')
+
+# Quotes and whitespace stripped from the ends of phone numbers
+PHONE_STRIP_CHARS = ' \t\'"'
+
 
 def normalize_name(full_name: str) -> tuple:
     """Split full name into first and last name"""
     if not full_name:
         return '', ''
     
-    parts = full_name.strip().split()
+    # First name is first part, last name is everything else
+    parts = full_name.split(None, 1)
+    if not parts:
+        return '', ''
     if len(parts) == 1:
         return parts[0], ''
-    elif len(parts) == 2:
-        return parts[0], parts[1]
-    else:
-        # First name is first part, last name is everything else
-        return parts[0], ' '.join(parts[1:])
+    return parts[0], ' '.join(parts[1].split())
+
+
+# CSV column names accepted for each lead field, in priority order.
+# Headers are matched lowercased with spaces/dashes turned into underscores,
+# so 'Company Name' and 'company-name' both match 'company_name'.
+FIELD_ALIASES = {
+    'full_name': ('full_name', 'name', 'contact_name'),
+    'first_name': ('first_name', 'firstname'),
+    'last_name': ('last_name', 'lastname'),
+    'email': ('email', 'email_address', 'e_mail'),
+    'phone': ('phone', 'phone_number', 'telephone', 'mobile',
+              'work_direct_phone', 'corporate_phone', 'mobile_phone'),
+    'company_name': ('company_name', 'company', 'organization', 'organization_name'),
+    'company_domain': ('domain', 'website', 'company_domain', 'company_website'),
+    'city': ('city', 'location', 'company_city'),
+    'country': ('country', 'company_country'),
+    'state': ('state', 'province', 'company_state'),
+    'industry': ('industry', 'sector'),
+    'title': ('title', 'position', 'job_title', 'role'),
+}
+
+
+def build_column_map(fieldnames: List[str]) -> Dict[str, tuple]:
+    """
+    Resolve FIELD_ALIASES against a CSV header
+    
+    Results are cached per header, so files with the same layout (and rows
+    mapped without an explicit column_map) only resolve aliases once. The
+    returned mapping is shared and must not be modified.
+    
+    Args:
+        fieldnames: CSV header row
+        
+    Returns:
+        Mapping of lead field to the matching header names, in lookup order
+    """
+    return _resolve_column_map(tuple(fieldnames))
+
+
+@lru_cache(maxsize=64)
+def _resolve_column_map(fieldnames: tuple) -> Dict[str, tuple]:
+    """Uncached build_column_map"""
+    # Later columns win when two headers normalize to the same key
+    headers_by_key = {}
+    for header in reversed(fieldnames):
+        if not isinstance(header, str):
+            continue  # Skip None keys (can happen with malformed CSV)
+        key = header.lower().strip().replace(' ', '_').replace('-', '_')
+        headers_by_key.setdefault(key, []).append(header)
+    
+    column_map = {}
+    for field, aliases in FIELD_ALIASES.items():
+        headers = []
+        for alias in aliases:
+            headers.extend(headers_by_key.get(alias, ()))
+        column_map[field] = tuple(headers)
+    return column_map
+
+
+def first_value(row: Dict[str, Any], headers: tuple) -> str:
+    """Return the first non-empty stripped value in row for the given headers"""
+    for header in headers:
+        value = row.get(header)
+        if value:
+            value = value.strip()
+            if value:
+                return value
+    return ''
 
 
-def map_csv_row_to_lead(row: Dict[str, Any], source_name: str = 'import') -> Dict[str, Any]:
+def map_csv_row_to_lead(
+    row: Dict[str, Any],
+    source_name: str = 'import',
+    column_map: Optional[Dict[str, tuple]] = None
+) -> Dict[str, Any]:
     """
     Map CSV row to lead data
     
-    Supports common CSV column names:
+    Supports common CSV column names (see FIELD_ALIASES):
     - name, full_name, first_name, last_name
     - email, email_address
     - phone, phone_number, telephone
@@ -47,32 +134,20 @@ def map_csv_row_to_lead(row: Dict[str, Any], source_name: str = 'import') -> Dic
     - country
     - industry
     - title, position, job_title
+    
+    Args:
+        row: CSV row keyed by header
+        source_name: Name for the import source
+        column_map: Result of build_column_map for the file's header; built
+            from the row's keys when omitted
     """
-    # Normalize column names (case-insensitive, handle spaces/underscores)
-    # Handle None keys (can happen with malformed CSV)
-    row_lower = {}
-    for k, v in row.items():
-        if k is None:
-            continue  # Skip None keys
-        if v is None or (isinstance(v, str) and not v.strip()):
-            continue  # Skip empty values
-        try:
-            # Normalize key: lowercase, strip, replace spaces/underscores
-            key_normalized = k.lower().strip().replace(' ', '_').replace('-', '_')
-            row_lower[key_normalized] = v.strip() if isinstance(v, str) else v
-            # Also store original format for lookup
-            row_lower[k.lower().strip()] = v.strip() if isinstance(v, str) else v
-        except AttributeError:
-            # If k is not a string, skip it
-            continue
+    if column_map is None:
+        column_map = build_column_map(row.keys())
     
     # Extract name - try multiple variations
-    full_name = (row_lower.get('full_name') or row_lower.get('name') or 
-                 row_lower.get('contact_name') or '')
-    first_name = (row_lower.get('first_name') or row_lower.get('firstname') or 
-                  row_lower.get('first name') or '')
-    last_name = (row_lower.get('last_name') or row_lower.get('lastname') or 
-                 row_lower.get('last name') or '')
+    full_name = first_value(row, column_map['full_name'])
+    first_name = first_value(row, column_map['first_name'])
+    last_name = first_value(row, column_map['last_name'])
     
     if not first_name and not last_name and full_name:
         first_name, last_name = normalize_name(full_name)
@@ -80,54 +155,36 @@ def map_csv_row_to_lead(row: Dict[str, Any], source_name: str = 'import') -> Dic
         full_name = f"{first_name or ''} {last_name or ''}".strip()
     
     # Extract email
-    email = (row_lower.get('email') or row_lower.get('email_address') or 
-             row_lower.get('e-mail') or '').strip()
+    email = first_value(row, column_map['email'])
     
     if not email:
         return None  # Skip rows without email
     
     # Extract phone - try multiple phone fields
-    phone = (row_lower.get('phone') or row_lower.get('phone_number') or 
-             row_lower.get('telephone') or row_lower.get('mobile') or 
-             row_lower.get('work_direct_phone') or row_lower.get('corporate_phone') or 
-             row_lower.get('mobile_phone') or '').strip()
+    phone = first_value(row, column_map['phone'])
     
-    # Clean up phone number (remove quotes, extra spaces)
+    # Clean up phone number (remove surrounding quotes and spaces in one pass)
     if phone:
-        phone = phone.strip("'\"")  # Remove surrounding quotes
-        phone = phone.strip()
+        phone = phone.strip(PHONE_STRIP_CHARS)
     
     # Extract company info - try multiple variations
-    company_name = (row_lower.get('company_name') or row_lower.get('company name') or
-                    row_lower.get('company') or row_lower.get('organization') or 
-                    row_lower.get('organization_name') or row_lower.get('organization name') or '').strip()
-    
-    company_domain = (row_lower.get('domain') or row_lower.get('website') or 
-                     row_lower.get('company_domain') or row_lower.get('company domain') or
-                     row_lower.get('company_website') or row_lower.get('company website') or '').strip()
+    company_name = first_value(row, column_map['company_name'])
+    company_domain = first_value(row, column_map['company_domain'])
     
     # Clean up domain
     if company_domain:
-        company_domain = company_domain.replace('https://', '').replace('http://', '').replace('www.', '')
-        company_domain = company_domain.rstrip('/')
-        if '/' in company_domain:
-            company_domain = company_domain.split('/')[0]
+        company_domain = DOMAIN_PREFIX_RE.sub('', company_domain, count=1).partition('/')[0]
     
     # Extract location - try multiple variations
-    city = (row_lower.get('city') or row_lower.get('location') or 
-            row_lower.get('company_city') or row_lower.get('company city') or '').strip()
-    country = (row_lower.get('country') or row_lower.get('company_country') or 
-               row_lower.get('company country') or '').strip()
-    state = (row_lower.get('state') or row_lower.get('province') or 
-             row_lower.get('company_state') or row_lower.get('company state') or '').strip()
+    city = first_value(row, column_map['city'])
+    country = first_value(row, column_map['country'])
+    state = first_value(row, column_map['state'])
     
     # Extract industry
-    industry = (row_lower.get('industry') or row_lower.get('sector') or '').strip()
+    industry = first_value(row, column_map['industry'])
     
     # Extract title - try multiple variations
-    title = (row_lower.get('title') or row_lower.get('position') or 
-             row_lower.get('job_title') or row_lower.get('job title') or
-             row_lower.get('role') or '').strip()
+    title = first_value(row, column_map['title'])
     
     # Use email as external_id for CSV imports
     external_id = email
@@ -154,10 +211,207 @@ def map_csv_row_to_lead(row: Dict[str, Any], source_name: str = 'import') -> Dic
     return lead_data
 
 
+def detect_delimiter(sample: str) -> str:
+    """
+    Detect the delimiter of a CSV file from a sample of its start
+    
+    Args:
+        sample: Text from the start of the file
+        
+    Returns:
+        One of ',', ';' or tab
+    """
+    # Try common delimiters - prioritize comma
+    # Count potential delimiters in first few lines
+    first_lines = [line for line in sample.split('\n', 3)[:3] if line.strip()]
+    comma_count = sum(line.count(',') for line in first_lines)
+    semicolon_count = sum(line.count(';') for line in first_lines)
+    tab_count = sum(line.count('\t') for line in first_lines)
+    
+    # Choose delimiter based on counts - be strict
+    # For CSV files, comma should be most common
+    if comma_count > 0:
+        # If comma is present, prefer it unless semicolon/tab is clearly dominant
+        if tab_count > comma_count * 2:  # Tab needs to be 2x more common
+            return '\t'
+        if semicolon_count > comma_count * 2:  # Semicolon needs to be 2x more common
+            return ';'
+        return ','  # Default to comma
+    if semicolon_count > tab_count:
+        return ';'
+    if tab_count > 0:
+        return '\t'
+    
+    # Fallback: try sniffer but only accept standard delimiters
+    try:
+        detected = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        # Only use if it's one of our accepted delimiters
+        if detected.delimiter in [',', ';', '\t']:
+            return detected.delimiter
+    except csv.Error:
+        pass
+    return ','  # Default to comma
+
+
+def iter_csv_rows(reader, fieldnames: List[str]):
+    """
+    Yield rows from a csv.reader as dicts keyed by header
+    
+    Behaves like csv.DictReader (blank lines skipped, extra values under the
+    None key, missing values as None) but avoids its per-row Python overhead.
+    
+    Args:
+        reader: csv.reader positioned after the header row
+        fieldnames: Header row
+    """
+    width = len(fieldnames)
+    for values in reader:
+        if not values:
+            continue
+        
+        row = dict(zip(fieldnames, values))
+        if len(values) > width:
+            row[None] = values[width:]
+        elif len(values) < width:
+            for key in fieldnames[len(values):]:
+                row[key] = None
+        yield row
+
+
+def insert_lead_batch(
+    session,
+    batch: List[Dict[str, Any]],
+    source_name: str,
+    import_batch_id: str
+) -> None:
+    """
+    Insert a batch of mapped leads along with their companies and sources
+    
+    Companies are resolved with one query per batch and leads/sources are
+    added with one flush each instead of a round trip per row.
+    
+    Args:
+        session: Database session
+        batch: Lead data dicts from map_csv_row_to_lead
+        source_name: Name for the import source
+        import_batch_id: Batch ID recorded on each lead source
+    """
+    # First row seen for a domain supplies the company details
+    company_fields = {}
+    for lead_data in batch:
+        domain = lead_data.get('company_domain')
+        if domain and domain not in company_fields:
+            company_fields[domain] = {
+                'name': lead_data.get('company_name'),
+                'industry': lead_data.get('industry'),
+                'country': lead_data.get('country'),
+                'city': lead_data.get('city')
+            }
+    
+    companies = CompanyCRUD.get_or_create_many(session, company_fields)
+    for lead_data in batch:
+        company = companies.get(lead_data.get('company_domain'))
+        if company:
+            lead_data['company_id'] = company.id
+    
+    leads = LeadCRUD.bulk_create(session, batch)
+    
+    LeadSourceCRUD.bulk_create(session, [
+        {
+            'lead_id': lead.id,
+            'source_type': 'import',
+            'source_name': source_name,
+            'provider_name': 'manual',
+            'external_id': lead_data.get('external_id'),
+            'import_batch_id': import_batch_id
+        }
+        for lead, lead_data in zip(leads, batch)
+    ])
+
+
+def drop_existing_leads(session, batch: List[tuple], stats: Dict[str, int]) -> List[tuple]:
+    """
+    Remove (row_num, row, lead_data) entries whose email already belongs to a lead
+    
+    Existing emails are looked up for the batch in one query, so only emails
+    that appear in the file are ever read from the database.
+    
+    Returns:
+        The entries to insert
+    """
+    existing = LeadCRUD.find_existing_emails(
+        session, [lead_data['email'].lower() for _, _, lead_data in batch]
+    )
+    if not existing:
+        return batch
+    
+    kept = []
+    for row_num, row, lead_data in batch:
+        if lead_data['email'].lower() in existing:
+            stats['skipped'] += 1
+            logger.debug(f"Row {row_num}: Skipped duplicate - {lead_data['email']}")
+        else:
+            kept.append((row_num, row, lead_data))
+    return kept
+
+
+def _log_row_error(row_num: int, row: Dict[str, Any]):
+    """Log a row that failed to import, with its traceback; call from an except block"""
+    logger.error(f"Row {row_num}: Error importing lead - {sys.exc_info()[1]}", exc_info=True)
+    logger.error(f"Row data: {row}")
+
+
+def commit_lead_batch(
+    session,
+    batch: List[tuple],
+    source_name: str,
+    import_batch_id: str,
+    stats: Dict[str, int]
+) -> None:
+    """
+    Insert and commit a batch of (row_num, row, lead_data) entries
+    
+    If the batch fails as a whole, it is retried row by row so a single bad
+    row only costs that row. The session is emptied afterwards so long
+    imports don't accumulate committed objects.
+    """
+    if not batch:
+        return
+    
+    try:
+        insert_lead_batch(session, [lead_data for _, _, lead_data in batch], source_name, import_batch_id)
+        session.commit()
+        stats['imported'] += len(batch)
+        # Drop committed objects so session memory stays bounded by one batch
+        session.expunge_all()
+        return
+    except Exception as e:
+        session.rollback()
+        logger.warning(f"Batch insert failed ({e}), retrying {len(batch)} rows individually")
+    
+    for row_num, row, lead_data in batch:
+        try:
+            lead_data.pop('company_id', None)
+            insert_lead_batch(session, [lead_data], source_name, import_batch_id)
+            session.commit()
+            stats['imported'] += 1
+            logger.debug(f"Row {row_num}: Successfully imported {lead_data['email']}")
+        except Exception:
+            stats['errors'] += 1
+            session.rollback()
+            _log_row_error(row_num, row)
+    
+    session.expunge_all()
+
+
 def import_csv_to_database(
     filepath: str,
     source_name: str = 'CSV Import',
-    skip_duplicates: bool = True
+    skip_duplicates: bool = True,
+    delimiter: Optional[str] = None,
+    progress: Optional[Callable[[Dict[str, int]], None]] = None,
+    batch_size: int = BATCH_SIZE,
+    import_batch_id: Optional[str] = None
 ) -> Dict[str, int]:
     """
     Import leads from CSV file
@@ -166,6 +420,12 @@ def import_csv_to_database(
         filepath: Path to CSV file
         source_name: Name for the import source
         skip_duplicates: Skip leads that already exist
+        delimiter: Field delimiter; detected from the file when omitted
+        progress: Called with the running statistics after each committed batch
+        batch_size: Leads inserted and committed together; memory use is
+            bounded by one batch regardless of file size
+        import_batch_id: Batch ID recorded on each lead source; defaults to
+            one derived from the file name
         
     Returns:
         Dictionary with import statistics
@@ -181,154 +441,89 @@ def import_csv_to_database(
     try:
         session = get_session()
         
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            # Try to detect delimiter
-            sample = f.read(1024)
-            f.seek(0)
-            
-            # Try common delimiters - prioritize comma
-            # Count potential delimiters in first few lines
-            first_lines = sample.split('\n')[:3]
-            comma_count = sum(line.count(',') for line in first_lines if line.strip())
-            semicolon_count = sum(line.count(';') for line in first_lines if line.strip())
-            tab_count = sum(line.count('\t') for line in first_lines if line.strip())
+        with open(filepath, 'rb', buffering=READ_BUFFER_SIZE) as raw:
+            if not delimiter:
+                # Try to detect delimiter from the buffered start of the file;
+                # peeking avoids a second read and works for non-seekable input
+                sample = raw.peek(SNIFF_SAMPLE_SIZE)[:SNIFF_SAMPLE_SIZE]
+                delimiter = detect_delimiter(sample.decode('utf-8', errors='ignore'))
             
-            # Choose delimiter based on counts - be strict
-            # For CSV files, comma should be most common
-            if comma_count > 0:
-                # If comma is present, prefer it unless semicolon/tab is clearly dominant
-                if tab_count > comma_count * 2:  # Tab needs to be 2x more common
-                    delimiter = '\t'
-                elif semicolon_count > comma_count * 2:  # Semicolon needs to be 2x more common
-                    delimiter = ';'
-                else:
-                    delimiter = ','  # Default to comma
-            elif semicolon_count > tab_count:
-                delimiter = ';'
-            elif tab_count > 0:
-                delimiter = '\t'
-            else:
-                # Fallback: try sniffer but only accept standard delimiters
-                delimiter = ','
-                try:
-                    sniffer = csv.Sniffer()
-                    detected = sniffer.sniff(sample, delimiters=',;\t')
-                    # Only use if it's one of our accepted delimiters
-                    if detected.delimiter in [',', ';', '\t']:
-                        delimiter = detected.delimiter
-                except:
-                    delimiter = ','  # Default to comma
+            f = io.TextIOWrapper(raw, encoding='utf-8', errors='ignore')
             
             logger.info(f"Using delimiter: '{delimiter}'")
             
-            reader = csv.DictReader(f, delimiter=delimiter)
+            reader = csv.reader(f, delimiter=delimiter)
             
-            # Check if we have headers
-            if not reader.fieldnames:
+            # Check if we have headers (skipping leading blank lines like DictReader)
+            fieldnames = next((values for values in reader if values), None)
+            if not fieldnames:
                 raise ValueError("CSV file appears to be empty or has no headers")
             
-            logger.info(f"CSV columns detected: {reader.fieldnames}")
+            logger.info(f"CSV columns detected: {fieldnames}")
+            column_map = build_column_map(fieldnames)
             
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
+            import_batch_id = import_batch_id or f'csv_import_{Path(filepath).stem}'
+            batch = []
+            
+            # Emails accepted from earlier rows of this file; emails already in
+            # the database are filtered out per batch by drop_existing_leads
+            seen_emails = set()
+            
+            # Parsing and mapping stay in-process: they cost a few microseconds
+            # per row against a few hundred for the inserts, and shipping rows
+            # to worker processes costs more than mapping them here
+            for row_num, row in enumerate(iter_csv_rows(reader, fieldnames), start=2):  # Start at 2 (header is row 1)
                 stats['total'] += 1
                 
-                # Skip completely empty rows
-                if not any(v and str(v).strip() for v in row.values()):
-                    stats['skipped'] += 1
-                    logger.debug(f"Row {row_num}: Skipped (empty row)")
-                    continue
-                
                 try:
                     # Map CSV row to lead data
-                    lead_data = map_csv_row_to_lead(row, source_name)
+                    lead_data = map_csv_row_to_lead(row, source_name, column_map)
                     
-                    if not lead_data or not lead_data.get('email'):
+                    # Rows without an email (including completely empty rows) are
+                    # skipped; only these need a scan of the values to pick the message
+                    if not lead_data:
                         stats['skipped'] += 1
-                        logger.warning(f"Row {row_num}: Skipped (no email). Row keys: {list(row.keys())}")
+                        if any(v and str(v).strip() for v in row.values()):
+                            logger.warning(f"Row {row_num}: Skipped (no email). Row keys: {list(row.keys())}")
+                        else:
+                            logger.debug(f"Row {row_num}: Skipped (empty row)")
                         continue
                     
-                    # Check for duplicates
+                    # Check for duplicates among earlier rows of this file
                     if skip_duplicates:
-                        existing_lead = LeadCRUD.get_by_email(session, lead_data['email'])
-                        if existing_lead:
+                        email_key = lead_data['email'].lower()
+                        if email_key in seen_emails:
                             stats['skipped'] += 1
                             logger.debug(f"Row {row_num}: Skipped duplicate - {lead_data['email']}")
                             continue
+                        seen_emails.add(email_key)
                     
-                    # Create company if needed
-                    company_id = None
-                    if lead_data.get('company_domain'):
-                        try:
-                            company = CompanyCRUD.get_or_create(
-                                session=session,
-                                domain=lead_data['company_domain'],
-                                name=lead_data.get('company_name'),
-                                industry=lead_data.get('industry'),
-                                country=lead_data.get('country'),
-                                city=lead_data.get('city')
-                            )
-                            company_id = company.id
-                            lead_data['company_id'] = company_id
-                        except Exception as e:
-                            logger.warning(f"Row {row_num}: Error creating company - {e}. Continuing without company.")
-                    
-                    # Remove raw_data if it can't be serialized
-                    if 'raw_data' in lead_data:
-                        try:
-                            import json
-                            json.dumps(lead_data['raw_data'])
-                        except:
-                            logger.warning(f"Row {row_num}: raw_data not JSON serializable, removing it")
-                            lead_data.pop('raw_data', None)
-                    
-                    # Create lead
-                    lead = LeadCRUD.create(
-                        session=session,
-                        **lead_data
-                    )
-                    
-                    # Create lead source (check if it already exists)
-                    try:
-                        existing_source = session.query(LeadSource).filter(
-                            LeadSource.lead_id == lead.id
-                        ).first()
-                        
-                        if not existing_source:
-                            LeadSourceCRUD.create(
-                                session=session,
-                                lead_id=lead.id,
-                                source_type='import',
-                                source_name=source_name,
-                                provider_name='manual',
-                                external_id=lead_data.get('external_id'),
-                                import_batch_id=f'csv_import_{Path(filepath).stem}'
-                            )
-                    except Exception as e:
-                        logger.warning(f"Row {row_num}: Error creating lead source - {e}. Lead created but source not tracked.")
+                    batch.append((row_num, row, lead_data))
                     
-                    stats['imported'] += 1
-                    logger.debug(f"Row {row_num}: Successfully imported {lead_data['email']}")
-                    
-                except Exception as e:
+                except Exception:
                     stats['errors'] += 1
-                    session.rollback()
-                    import traceback
-                    error_msg = f"Row {row_num}: Error importing lead - {e}"
-                    logger.error(error_msg)
-                    logger.error(f"Row data: {row}")
-                    logger.error(f"Full traceback:\n{traceback.format_exc()}")
-                    # Print to console for web UI visibility
-                    print(f"ERROR Row {row_num}: {e}")
-                    print(f"Row data: {row}")
+                    _log_row_error(row_num, row)
+                
+                if len(batch) >= batch_size:
+                    if skip_duplicates:
+                        batch = drop_existing_leads(session, batch, stats)
+                    commit_lead_batch(session, batch, source_name, import_batch_id, stats)
+                    batch = []
+                    if progress:
+                        progress(stats)
+            
+            if skip_duplicates and batch:
+                batch = drop_existing_leads(session, batch, stats)
+            commit_lead_batch(session, batch, source_name, import_batch_id, stats)
+            if progress:
+                progress(stats)
         
-        session.commit()
         logger.info(f"Committed {stats['imported']} leads to database")
         
     except Exception as e:
         if session:
             session.rollback()
         logger.error(f"Fatal error during import: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         raise
     finally:
@@ -345,13 +540,18 @@ if __name__ == '__main__':
     parser.add_argument('file', help='CSV file to import')
     parser.add_argument('--source-name', default='CSV Import', help='Source name')
     parser.add_argument('--no-skip-duplicates', action='store_true', help='Import duplicates too')
+    parser.add_argument('--delimiter', help='Field delimiter (skips auto-detection)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help=f'Leads inserted per commit (default: {BATCH_SIZE})')
     
     args = parser.parse_args()
     
     stats = import_csv_to_database(
         filepath=args.file,
         source_name=args.source_name,
-        skip_duplicates=not args.no_skip_duplicates
+        skip_duplicates=not args.no_skip_duplicates,
+        delimiter=args.delimiter,
+        batch_size=args.batch_size
     )
     
     logger.info("\n" + "=" * 60)
@@ -8,16 +8,18 @@ import sys
 import os
 from pathlib import Path
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
 # Add parent directory to path to import src modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.apify_client import get_default_client
 from src.email_scraper import EmailScraper
 from src.phone_scraper import PhoneScraper
 from src.data_manager import DataManager
 from scripts.import_apify_leads import import_leads_to_database
-from dotenv import load_dotenv
+from src._env_cache import load_env_once
 
 # Configure logging
 logging.basicConfig(
@@ -45,6 +47,9 @@ Examples:
 
   # Save to specific filename
   python scripts/scrape_leads_apify.py --type email --locations chennai --output my_leads
+
+  # Save the CSV exactly as Apify renders it (single --type only)
+  python scripts/scrape_leads_apify.py --type email --locations chennai --format raw-csv
         """
     )
 
@@ -102,9 +107,15 @@ Examples:
 
     parser.add_argument(
         '--format',
-        choices=['json', 'csv', 'both'],
+        choices=['json', 'csv', 'both', 'raw-csv'],
         default='both',
-        help='Output format (default: both)'
+        help='Output format (default: both). raw-csv saves the dataset as rendered by Apify'
+    )
+
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Indent JSON output for reading (default: compact)'
     )
 
     parser.add_argument(
@@ -127,7 +138,7 @@ Examples:
     return parser.parse_args()
 
 
-def scrape_emails(args) -> tuple[List[dict], dict]:
+def scrape_emails(args, fetch_items: bool = True) -> tuple[List[dict], dict]:
     """Scrape emails using email scraper"""
     logger.info("=" * 60)
     logger.info("Starting EMAIL scraping")
@@ -143,14 +154,16 @@ def scrape_emails(args) -> tuple[List[dict], dict]:
                 'industries': args.industries,
                 'employeeSizeMin': args.employee_min,
                 'employeeSizeMax': args.employee_max
-            } if args.industries or args.employee_max else None
+            } if args.industries or args.employee_max else None,
+            fetch_items=fetch_items
         )
 
         # Print summary
-        summary = EmailScraper.extract_email_summary(results)
-        logger.info("\nEmail Scraping Summary:")
-        for key, value in summary.items():
-            logger.info(f"  {key}: {value}")
+        if fetch_items:
+            summary = EmailScraper.extract_email_summary(results)
+            logger.info("\nEmail Scraping Summary:")
+            for key, value in summary.items():
+                logger.info(f"  {key}: {value}")
 
         return results, run_data
 
@@ -159,7 +172,7 @@ def scrape_emails(args) -> tuple[List[dict], dict]:
         raise
 
 
-def scrape_phones(args) -> tuple[List[dict], dict]:
+def scrape_phones(args, fetch_items: bool = True) -> tuple[List[dict], dict]:
     """Scrape phone numbers using phone scraper"""
     logger.info("=" * 60)
     logger.info("Starting PHONE NUMBER scraping")
@@ -174,14 +187,16 @@ def scrape_phones(args) -> tuple[List[dict], dict]:
             company_types=args.company_types,
             employee_size_min=args.employee_min,
             employee_size_max=args.employee_max,
-            max_results=args.max_results
+            max_results=args.max_results,
+            fetch_items=fetch_items
         )
 
         # Print summary
-        summary = PhoneScraper.extract_phone_summary(results)
-        logger.info("\nPhone Scraping Summary:")
-        for key, value in summary.items():
-            logger.info(f"  {key}: {value}")
+        if fetch_items:
+            summary = PhoneScraper.extract_phone_summary(results)
+            logger.info("\nPhone Scraping Summary:")
+            for key, value in summary.items():
+                logger.info(f"  {key}: {value}")
 
         return results, run_data
 
@@ -193,7 +208,7 @@ def scrape_phones(args) -> tuple[List[dict], dict]:
 def main():
     """Main execution function"""
     # Load environment variables
-    load_dotenv()
+    load_env_once()
 
     # Parse arguments
     args = parse_arguments()
@@ -205,31 +220,47 @@ def main():
         logger.error("Please set it in .env file or pass via --token argument")
         sys.exit(1)
 
+    if args.format == 'raw-csv' and args.type == 'both':
+        logger.error("Error: --format raw-csv needs a single --type (email or phone)")
+        sys.exit(1)
+
+    if args.format == 'raw-csv' and args.save_to_db:
+        logger.error("Error: --format raw-csv can't be combined with --save-to-db")
+        sys.exit(1)
+
+    # raw-csv saves the dataset as Apify renders it, so the JSON items are never downloaded
+    fetch_items = args.format != 'raw-csv'
+
     # Initialize data manager
     data_manager = DataManager()
 
     try:
         # Perform scraping based on type
-        all_results = []
         email_run_data = None
         phone_run_data = None
 
-        if args.type in ['email', 'both']:
-            email_results, email_run_data = scrape_emails(args)
-            all_results.extend(email_results)
-
-        if args.type in ['phone', 'both']:
-            phone_results, phone_run_data = scrape_phones(args)
-            if args.type == 'both':
-                # Merge with email results
-                all_results = data_manager.merge_datasets(
-                    [all_results, phone_results],
-                    deduplicate_by='email' if email_results else None
-                )
-            else:
-                all_results.extend(phone_results)
+        if args.type == 'both':
+            # The two actor runs are independent and spend their time waiting
+            # on Apify, so run them side by side
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                email_future = executor.submit(scrape_emails, args)
+                phone_future = executor.submit(scrape_phones, args)
+                email_results, email_run_data = email_future.result()
+                phone_results, phone_run_data = phone_future.result()
+
+            # Merge phone results into email results
+            all_results = data_manager.merge_datasets(
+                [email_results, phone_results],
+                deduplicate_by='email' if email_results else None
+            )
+
+        elif args.type == 'email':
+            all_results, email_run_data = scrape_emails(args, fetch_items=fetch_items)
 
-        if not all_results:
+        else:
+            all_results, phone_run_data = scrape_phones(args, fetch_items=fetch_items)
+
+        if fetch_items and not all_results:
             logger.warning("No results found!")
             return
 
@@ -250,7 +281,8 @@ def main():
             output_path = data_manager.save_json(
                 all_results,
                 filename=filename,
-                include_timestamp=include_timestamp
+                include_timestamp=include_timestamp,
+                pretty=args.pretty
             )
             logger.info(f"\nResults saved to: {output_path}")
 
@@ -262,11 +294,30 @@ def main():
             )
             logger.info(f"\nResults saved to: {output_path}")
 
+        elif args.format == 'raw-csv':
+            # Let Apify serialize the dataset instead of re-encoding it locally
+            run_data = email_run_data or phone_run_data
+            csv_bytes = get_default_client(args.token).get_dataset_items(
+                run_data.get('defaultDatasetId'),
+                format='csv',
+                as_bytes=True
+            )
+            if not csv_bytes.strip():
+                logger.warning("No results found!")
+                return
+            output_path = data_manager.save_csv_raw(
+                csv_bytes,
+                filename=filename,
+                include_timestamp=include_timestamp
+            )
+            logger.info(f"\nResults saved to: {output_path}")
+
         else:  # both
             output_paths = data_manager.save_both_formats(
                 all_results,
                 filename=filename,
-                include_timestamp=include_timestamp
+                include_timestamp=include_timestamp,
+                pretty=args.pretty
             )
             logger.info(f"\nResults saved to:")
             logger.info(f"  JSON: {output_paths['json']}")
@@ -319,12 +370,13 @@ def main():
             logger.info(f"  Errors: {import_stats['errors']}")
 
         # Print final summary
-        logger.info("\n" + "=" * 60)
-        logger.info("Overall Summary:")
-        logger.info("=" * 60)
-        summary = data_manager.get_summary_stats(all_results)
-        for key, value in summary.items():
-            logger.info(f"  {key}: {value}")
+        if fetch_items:
+            logger.info("\n" + "=" * 60)
+            logger.info("Overall Summary:")
+            logger.info("=" * 60)
+            summary = data_manager.get_summary_stats(all_results)
+            for key, value in summary.items():
+                logger.info(f"  {key}: {value}")
 
         logger.info("\n✓ Scraping completed successfully!")
 
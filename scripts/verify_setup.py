@@ -3,58 +3,58 @@
 Setup verification script
 Checks if all dependencies and configuration are properly set up
 """
+import io
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Third-party packages the scrapers need (import names)
+REQUIRED_PACKAGES = ['requests', 'yaml', 'dotenv']
 
-def check_python_version():
+
+def check_python_version(out=None):
     """Check Python version"""
-    print("Checking Python version...", end=" ")
+    print("Checking Python version...", end=" ", file=out)
     version = sys.version_info
     if version.major >= 3 and version.minor >= 7:
-        print(f"✓ Python {version.major}.{version.minor}.{version.micro}")
+        print(f"✓ Python {version.major}.{version.minor}.{version.micro}", file=out)
         return True
     else:
-        print(f"✗ Python {version.major}.{version.minor}.{version.micro}")
-        print("  Error: Python 3.7+ required")
+        print(f"✗ Python {version.major}.{version.minor}.{version.micro}", file=out)
+        print("  Error: Python 3.7+ required", file=out)
         return False
 
 
-def check_dependencies():
+def check_dependencies(out=None):
     """Check if required packages are installed"""
-    print("\nChecking dependencies...")
+    print("\nChecking dependencies...", file=out)
 
-    required = ['requests', 'yaml', 'dotenv']
     missing = []
 
-    for package in required:
-        try:
-            if package == 'yaml':
-                import yaml
-            elif package == 'dotenv':
-                import dotenv
-            else:
-                __import__(package)
-            print(f"  ✓ {package}")
-        except ImportError:
-            print(f"  ✗ {package} - NOT INSTALLED")
+    # find_spec only locates the package, without running its import
+    for package in REQUIRED_PACKAGES:
+        if find_spec(package) is not None:
+            print(f"  ✓ {package}", file=out)
+        else:
+            print(f"  ✗ {package} - NOT INSTALLED", file=out)
             missing.append(package)
 
     if missing:
-        print(f"\nError: Missing packages: {', '.join(missing)}")
-        print("Run: pip install -r requirements.txt")
+        print(f"\nError: Missing packages: {', '.join(missing)}", file=out)
+        print("Run: pip install -r requirements.txt", file=out)
         return False
 
     return True
 
 
-def check_directories():
+def check_directories(out=None):
     """Check if required directories exist"""
-    print("\nChecking directories...")
+    print("\nChecking directories...", file=out)
 
     required_dirs = [
         'config',
@@ -67,17 +67,17 @@ def check_directories():
     for dir_path in required_dirs:
         path = Path(dir_path)
         if path.exists():
-            print(f"  ✓ {dir_path}/")
+            print(f"  ✓ {dir_path}/", file=out)
         else:
-            print(f"  ✗ {dir_path}/ - NOT FOUND")
+            print(f"  ✗ {dir_path}/ - NOT FOUND", file=out)
             all_exist = False
 
     return all_exist
 
 
-def check_config_files():
+def check_config_files(out=None):
     """Check if configuration files exist"""
-    print("\nChecking configuration files...")
+    print("\nChecking configuration files...", file=out)
 
     files = {
         'config/config.yaml': True,
@@ -89,39 +89,39 @@ def check_config_files():
     for filepath, required in files.items():
         path = Path(filepath)
         if path.exists():
-            print(f"  ✓ {filepath}")
+            print(f"  ✓ {filepath}", file=out)
         else:
             if required:
-                print(f"  ✗ {filepath} - NOT FOUND (required)")
+                print(f"  ✗ {filepath} - NOT FOUND (required)", file=out)
                 all_exist = False
             else:
-                print(f"  ⚠ {filepath} - NOT FOUND (optional)")
+                print(f"  ⚠ {filepath} - NOT FOUND (optional)", file=out)
 
     return all_exist
 
 
-def check_api_token():
+def check_api_token(out=None):
     """Check if API token is configured"""
-    print("\nChecking API token...")
+    print("\nChecking API token...", file=out)
 
-    from dotenv import load_dotenv
-    load_dotenv()
+    from src._env_cache import load_env_once
+    load_env_once()
 
     token = os.getenv('APIFY_API_TOKEN')
 
     if token:
         masked_token = token[:8] + "..." + token[-4:] if len(token) > 12 else "***"
-        print(f"  ✓ APIFY_API_TOKEN found ({masked_token})")
+        print(f"  ✓ APIFY_API_TOKEN found ({masked_token})", file=out)
         return True
     else:
-        print("  ✗ APIFY_API_TOKEN not found")
-        print("    Set it in .env file or environment variables")
+        print("  ✗ APIFY_API_TOKEN not found", file=out)
+        print("    Set it in .env file or environment variables", file=out)
         return False
 
 
-def check_modules():
+def check_modules(out=None):
     """Check if custom modules can be imported"""
-    print("\nChecking custom modules...")
+    print("\nChecking custom modules...", file=out)
 
     modules = [
         'src.apify_client',
@@ -134,25 +134,32 @@ def check_modules():
     for module in modules:
         try:
             __import__(module)
-            print(f"  ✓ {module}")
+            print(f"  ✓ {module}", file=out)
         except Exception as e:
-            print(f"  ✗ {module} - {e}")
+            print(f"  ✗ {module} - {e}", file=out)
             all_ok = False
 
     return all_ok
 
 
-def test_api_connection():
+def skip_modules(out=None):
+    """Report the custom module check as skipped"""
+    print("\nChecking custom modules...", file=out)
+    print("  ⚠ Skipped (missing dependencies)", file=out)
+    return False
+
+
+def test_api_connection(out=None):
     """Test API connection (optional)"""
-    print("\nTesting API connection...")
+    print("\nTesting API connection...", file=out)
 
-    from dotenv import load_dotenv
-    load_dotenv()
+    from src._env_cache import load_env_once
+    load_env_once()
 
     token = os.getenv('APIFY_API_TOKEN')
 
     if not token:
-        print("  ⚠ Skipped (no API token)")
+        print("  ⚠ Skipped (no API token)", file=out)
         return True
 
     try:
@@ -163,18 +170,27 @@ def test_api_connection():
         info = client.get_actor_info('T1XDXWc1L92AfIJtd')
 
         if info:
-            print(f"  ✓ API connection successful")
-            print(f"    Actor: {info.get('name', 'Unknown')}")
+            print(f"  ✓ API connection successful", file=out)
+            print(f"    Actor: {info.get('name', 'Unknown')}", file=out)
             return True
         else:
-            print("  ✗ API connection failed")
+            print("  ✗ API connection failed", file=out)
             return False
 
     except Exception as e:
-        print(f"  ✗ API connection failed: {e}")
+        print(f"  ✗ API connection failed: {e}", file=out)
         return False
 
 
+def run_captured(check_func):
+    """Run a check with its output buffered; returns (result, output, exception)"""
+    out = io.StringIO()
+    try:
+        return check_func(out), out.getvalue(), None
+    except Exception as e:
+        return False, out.getvalue(), e
+
+
 def main():
     """Main verification function"""
     print("=" * 60)
@@ -190,23 +206,37 @@ def main():
         ("Custom Modules", check_modules),
     ]
 
-    results = {}
-    for name, check_func in checks:
-        try:
-            results[name] = check_func()
-        except Exception as e:
-            print(f"\n✗ {name} check failed with exception: {e}")
-            results[name] = False
-
-    # Optional API connection test
-    print("\n" + "-" * 60)
-    print("Optional Tests")
-    print("-" * 60)
-    try:
-        api_ok = test_api_connection()
-        results["API Connection"] = api_ok
-    except Exception as e:
-        print(f"  ⚠ API connection test failed: {e}")
+    # Importing the custom modules pulls in requests/yaml/dotenv, so don't
+    # try when those aren't installed
+    if not all(find_spec(package) is not None for package in REQUIRED_PACKAGES):
+        checks[-1] = ("Custom Modules", skip_modules)
+
+    # The checks are independent and mostly wait on imports, the filesystem
+    # and the network, so run them (and the API test) concurrently. Each one
+    # writes to its own buffer, printed in the usual order once it finishes.
+    with ThreadPoolExecutor(max_workers=len(checks) + 1) as executor:
+        futures = [(name, executor.submit(run_captured, check_func)) for name, check_func in checks]
+        api_future = executor.submit(run_captured, test_api_connection)
+
+        results = {}
+        for name, future in futures:
+            result, output, error = future.result()
+            print(output, end="")
+            if error:
+                print(f"\n✗ {name} check failed with exception: {error}")
+                result = False
+            results[name] = result
+
+        # Optional API connection test
+        print("\n" + "-" * 60)
+        print("Optional Tests")
+        print("-" * 60)
+        api_ok, output, error = api_future.result()
+        print(output, end="")
+        if error:
+            print(f"  ⚠ API connection test failed: {error}")
+        else:
+            results["API Connection"] = api_ok
 
     # Summary
     print("\n" + "=" * 60)
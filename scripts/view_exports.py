@@ -2,8 +2,10 @@
 """
 Utility script to view and manage exported data files
 """
+import os
 import sys
 import json
+from itertools import chain
 from pathlib import Path
 from datetime import datetime
 
@@ -13,40 +15,65 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.data_manager import DataManager
 
 
+def scan_exports(directory):
+    """
+    Split an export directory into JSON and CSV files in one scandir pass
+
+    Each file is stat'ed once; the result is reused for sorting and display.
+
+    Returns:
+        Tuple of (json_entries, csv_entries), each a list of (path, stat) newest first
+    """
+    json_entries = []
+    csv_entries = []
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith('.json'):
+                target = json_entries
+            elif entry.name.endswith('.csv'):
+                target = csv_entries
+            else:
+                continue
+            target.append((Path(entry.path), entry.stat()))
+
+    json_entries.sort(key=lambda item: item[1].st_mtime, reverse=True)
+    csv_entries.sort(key=lambda item: item[1].st_mtime, reverse=True)
+    return json_entries, csv_entries
+
+
+def print_files(entries):
+    """Print name, size and modification time for (path, stat) entries"""
+    for i, (file, stat) in enumerate(entries, 1):
+        size = stat.st_size / 1024  # KB
+        mtime = datetime.fromtimestamp(stat.st_mtime)
+        print(f"  {i}. {file.name}")
+        print(f"     Size: {size:.2f} KB | Modified: {mtime.strftime('%Y-%m-%d %H:%M:%S')}")
+
+
 def list_exports():
     """List all exported files"""
     dm = DataManager()
 
-    json_files = dm.list_exports("*.json")
-    csv_files = dm.list_exports("*.csv")
+    json_entries, csv_entries = scan_exports(dm.output_dir)
 
     print("=" * 60)
     print("Exported Files")
     print("=" * 60)
 
     print("\nJSON Files:")
-    if json_files:
-        for i, file in enumerate(json_files, 1):
-            stat = file.stat()
-            size = stat.st_size / 1024  # KB
-            mtime = datetime.fromtimestamp(stat.st_mtime)
-            print(f"  {i}. {file.name}")
-            print(f"     Size: {size:.2f} KB | Modified: {mtime.strftime('%Y-%m-%d %H:%M:%S')}")
+    if json_entries:
+        print_files(json_entries)
     else:
         print("  No JSON files found")
 
     print("\nCSV Files:")
-    if csv_files:
-        for i, file in enumerate(csv_files, 1):
-            stat = file.stat()
-            size = stat.st_size / 1024  # KB
-            mtime = datetime.fromtimestamp(stat.st_mtime)
-            print(f"  {i}. {file.name}")
-            print(f"     Size: {size:.2f} KB | Modified: {mtime.strftime('%Y-%m-%d %H:%M:%S')}")
+    if csv_entries:
+        print_files(csv_entries)
     else:
         print("  No CSV files found")
 
-    return json_files, csv_files
+    return [path for path, _ in json_entries], [path for path, _ in csv_entries]
 
 
 def view_file_summary(filepath):
@@ -54,21 +81,24 @@ def view_file_summary(filepath):
     dm = DataManager()
 
     try:
-        data = dm.load_json(filepath)
+        # Stream the records so large exports aren't held in memory; keep
+        # the first one aside for the sample
+        records = dm.iter_json(filepath)
+        first_record = next(records, None)
 
         print("\n" + "=" * 60)
         print(f"File: {Path(filepath).name}")
         print("=" * 60)
 
-        summary = dm.get_summary_stats(data)
+        summary = dm.get_summary_stats(chain([first_record], records) if first_record is not None else [])
 
         print("\nSummary Statistics:")
         for key, value in summary.items():
             print(f"  {key}: {value}")
 
-        if data:
+        if first_record is not None:
             print("\nSample Record (first item):")
-            print(json.dumps(data[0], indent=2))
+            print(json.dumps(first_record, indent=2))
 
     except Exception as e:
         print(f"Error reading file: {e}")
@@ -0,0 +1,93 @@
+"""
+Parse scraper YAML config files once and share the result between instances
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader  # PyYAML built without libyaml
+
+# Most config files kept parsed at once; least recently used are dropped first
+MAX_CACHED_CONFIGS = 100
+
+# resolved path -> (st_mtime_ns, st_size, parsed config)
+_CONFIG_CACHE: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+_CONFIG_LOCK = threading.Lock()
+
+
+def load_config_cached(config_path) -> Dict[str, Any]:
+    """
+    Load a YAML config file, reusing the parsed dict while the file is unchanged
+
+    The file is re-parsed when its mtime or size changes. The returned dict is
+    shared by every caller, so treat it as read-only.
+
+    Args:
+        config_path: Path to the YAML file
+
+    Returns:
+        Parsed configuration
+    """
+    path = os.path.realpath(config_path)
+    stat = os.stat(path)
+
+    with _CONFIG_LOCK:
+        cached = _CONFIG_CACHE.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            _CONFIG_CACHE.move_to_end(path)
+            return cached[2]
+
+    config = _parse_config(path, stat)
+
+    with _CONFIG_LOCK:
+        _CONFIG_CACHE[path] = (stat.st_mtime_ns, stat.st_size, config)
+        _CONFIG_CACHE.move_to_end(path)
+        while len(_CONFIG_CACHE) > MAX_CACHED_CONFIGS:
+            _CONFIG_CACHE.popitem(last=False)
+
+    return config
+
+
+def _parse_config(path: str, stat: os.stat_result) -> Dict[str, Any]:
+    """
+    Parse a YAML config, going through a JSON copy next to it when that is current
+
+    <path>.json is written after a YAML parse, together with the YAML file's
+    mtime and size. Later processes use it only while both still match, so
+    restoring an older YAML (git checkout, cp -p) doesn't pick up a stale
+    copy; JSON decodes much faster. The copy is skipped when the config
+    doesn't survive a JSON round trip (e.g. dates or non-string keys) or the
+    directory isn't writable.
+    """
+    json_path = path + '.json'
+    source = [stat.st_mtime_ns, stat.st_size]
+
+    try:
+        with open(json_path, 'rb') as f:
+            cached = json.loads(f.read())
+        if isinstance(cached, dict) and cached.get('source') == source:
+            return cached['config']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    with open(path, 'r') as f:
+        config = yaml.load(f, Loader=_SafeLoader)
+
+    try:
+        encoded = json.dumps({'source': source, 'config': config})
+        if json.loads(encoded)['config'] == config:
+            tmp_path = f"{json_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.write(encoded)
+            os.replace(tmp_path, json_path)
+    except (OSError, TypeError, ValueError):
+        pass
+
+    return config
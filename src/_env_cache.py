@@ -0,0 +1,19 @@
+"""
+Load the project's .env file at most once per process
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def load_env_once() -> bool:
+    """
+    Load variables from .env into os.environ on the first call only
+
+    Later calls return the cached result without touching the file again.
+    Existing environment variables are never overridden.
+
+    Returns:
+        True if a .env file was found and loaded
+    """
+    from dotenv import load_dotenv
+    return load_dotenv()
@@ -0,0 +1,114 @@
+"""
+Shared setup for the Apify actor scrapers
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional, Iterator, ClassVar
+from pathlib import Path
+
+from .apify_client import ApifyClient, get_default_client
+from ._config_cache import load_config_cached
+
+_DEFAULT_CONFIG_PATH = str(Path(__file__).resolve().parent.parent / "config" / "config.yaml")
+
+
+def _pct(count: int, total: int) -> str:
+    """Format count/total as a one-decimal percentage ("0%" when total is 0)"""
+    if not total:
+        return "0%"
+    return f"{count / total * 100:.1f}%"
+
+
+class _ApifyScraperBase(ABC):
+    """Client, config and run plumbing shared by EmailScraper and PhoneScraper"""
+
+    # Set by subclasses: the Apify actor to run and its section under `actors` in config.yaml
+    ACTOR_ID: ClassVar[str]
+    CONFIG_KEY: ClassVar[str]
+
+    __slots__ = ('client', '_config_path', 'actor_config', 'api_config', '_poll_interval', '_timeout')
+
+    # Slots filled from config.yaml on first access rather than in __init__
+    _CONFIG_ATTRS = frozenset({'actor_config', 'api_config', '_poll_interval', '_timeout'})
+
+    def __init__(
+        self,
+        api_token: Optional[str] = None,
+        config_path: Optional[str] = None,
+        client: Optional[ApifyClient] = None
+    ):
+        """
+        Initialize scraper
+
+        Args:
+            api_token: Apify API token
+            config_path: Path to config.yaml file
+            client: ApifyClient to use; defaults to the shared client for api_token
+        """
+        self.client = client or get_default_client(api_token)
+
+        # The config file is read on first use of a config attribute (see __getattr__)
+        self._config_path = config_path or _DEFAULT_CONFIG_PATH
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for unset slots, so after the first load this is never hit
+        if name not in self._CONFIG_ATTRS:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        self._load_config()
+        return object.__getattribute__(self, name)
+
+    def _load_config(self):
+        """Fill the config slots from the sections used here; the full tree stays in the shared cache"""
+        config = load_config_cached(self._config_path)
+        self.actor_config = config['actors'][self.CONFIG_KEY]
+        self.api_config = config['api']
+        self._poll_interval = self.api_config['poll_interval']
+        self._timeout = self.api_config['timeout']
+
+    @abstractmethod
+    def _build_input(self, *args, **kwargs) -> Dict[str, Any]:
+        """Build the actor input from scrape() arguments"""
+
+    @abstractmethod
+    def scrape(self, *args, **kwargs) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Run the actor and return (run_data, results)"""
+
+    def iter_results(
+        self,
+        *args,
+        chunk_size: int = 1000,
+        **kwargs
+    ) -> tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """
+        Like scrape(), but stream the results from the dataset page by page
+
+        Takes the same arguments as scrape(). Only one page of chunk_size
+        records is held at a time, and the extract_*_summary helpers accept
+        the iterator directly.
+
+        Returns:
+            Tuple of (run_data, results iterator)
+        """
+        input_data = self._build_input(*args, **kwargs)
+
+        return self.client.run_and_iter(
+            actor_id=self.ACTOR_ID,
+            input_data=input_data,
+            poll_interval=self._poll_interval,
+            max_wait_time=self._timeout,
+            chunk_size=chunk_size
+        )
+
+    async def scrape_async(self, *args, **kwargs) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Run scrape() in a worker thread so several scrapes can be awaited together
+
+        Takes the same arguments as scrape(), e.g.
+        ``await asyncio.gather(email.scrape_async(...), phone.scrape_async(...))``
+        waits for the slowest run rather than the sum of all of them.
+
+        Returns:
+            Tuple of (run_data, results)
+        """
+        return await asyncio.to_thread(self.scrape, *args, **kwargs)
@@ -1,16 +1,46 @@
 """
 Apify API Client for actor execution and data retrieval
 """
+import json
 import os
+import threading
 import time
+from concurrent.futures import Future
+from functools import lru_cache
 import requests
-from typing import Dict, Any, Optional, List
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Optional, List, Iterator
 from datetime import datetime
 import logging
 
+from ._env_cache import load_env_once
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # Optional: parse dataset pages incrementally in get_dataset_items_iter
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Upper bound for the backoff between run status checks
+MAX_POLL_INTERVAL = 30
+
+# Longest server-side wait Apify allows for waitForFinish on run status calls
+WAIT_FOR_FINISH_SECONDS = 60
+
+# Transient server errors retried by the session adapter
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+# Actor metadata by (api_token, actor_id); static for the life of the process
+_actor_info_cache: Dict[tuple, Dict[str, Any]] = {}
+
+# run_and_wait calls in progress by (api_token, actor_id, input JSON), so identical
+# concurrent requests share one actor run
+_inflight_runs: Dict[tuple, Future] = {}
+_inflight_lock = threading.Lock()
+
 
 class ApifyClient:
     """Client for interacting with Apify API"""
@@ -22,6 +52,8 @@ class ApifyClient:
         Args:
             api_token: Apify API token. If not provided, reads from APIFY_API_TOKEN env var
         """
+        if not api_token:
+            load_env_once()
         self.api_token = api_token or os.getenv('APIFY_API_TOKEN')
         if not self.api_token:
             raise ValueError(
@@ -34,6 +66,30 @@ class ApifyClient:
         self.session.headers.update({
             'Content-Type': 'application/json'
         })
+        retries = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUS_CODES,
+            # Only reads are retried on 5xx and read errors. A run-creating POST
+            # may already have reached Apify, so it is retried only on connect errors
+            allowed_methods=frozenset({'GET'}),
+            raise_on_status=False
+        )
+        self.session.mount(
+            'https://',
+            HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retries)
+        )
+        self._auth_params = {'token': self.api_token}
+
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def run_actor(
         self,
@@ -55,8 +111,6 @@ class ApifyClient:
             Run information including run ID and dataset ID
         """
         url = f"{self.base_url}/acts/{actor_id}/runs"
-        params = {'token': self.api_token}
-
         logger.info(f"Starting actor {actor_id}...")
         logger.debug(f"Input data: {input_data}")
 
@@ -64,7 +118,7 @@ class ApifyClient:
             response = self.session.post(
                 url,
                 json=input_data,
-                params=params,
+                params=self._auth_params,
                 timeout=30
             )
             response.raise_for_status()
@@ -82,21 +136,24 @@ class ApifyClient:
             logger.error(f"Failed to start actor: {e}")
             raise
 
-    def get_run_status(self, run_id: str) -> Dict[str, Any]:
+    def get_run_status(self, run_id: str, wait_for_finish: int = 0) -> Dict[str, Any]:
         """
         Get the status of an actor run
 
         Args:
             run_id: The run ID to check
+            wait_for_finish: Seconds the server may hold the request while the run is still going
 
         Returns:
             Run status information
         """
         url = f"{self.base_url}/actor-runs/{run_id}"
-        params = {'token': self.api_token}
+        params = self._auth_params
+        if wait_for_finish:
+            params = {**params, 'waitForFinish': wait_for_finish}
 
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10 + wait_for_finish)
             response.raise_for_status()
 
             result = response.json()
@@ -109,15 +166,19 @@ class ApifyClient:
     def wait_for_completion(
         self,
         run_id: str,
-        poll_interval: int = 5,
+        poll_interval: float = 1,
         max_wait_time: int = 3600
     ) -> Dict[str, Any]:
         """
         Wait for an actor run to complete
 
+        Status requests use Apify's waitForFinish, so the server holds each one
+        until the run finishes (or WAIT_FOR_FINISH_SECONDS pass). If that is
+        rejected, falls back to polling with a 1.5x backoff up to MAX_POLL_INTERVAL.
+
         Args:
             run_id: The run ID to wait for
-            poll_interval: Seconds between status checks
+            poll_interval: Initial seconds between status checks when polling
             max_wait_time: Maximum time to wait in seconds
 
         Returns:
@@ -125,13 +186,27 @@ class ApifyClient:
         """
         logger.info(f"Waiting for run {run_id} to complete...")
         start_time = time.time()
+        polls = 0
+        long_poll = True
 
         while True:
             elapsed = time.time() - start_time
             if elapsed > max_wait_time:
                 raise TimeoutError(f"Run did not complete within {max_wait_time} seconds")
 
-            status_data = self.get_run_status(run_id)
+            if long_poll:
+                wait = max(1, min(WAIT_FOR_FINISH_SECONDS, int(max_wait_time - elapsed)))
+                try:
+                    status_data = self.get_run_status(run_id, wait_for_finish=wait)
+                except requests.exceptions.HTTPError as e:
+                    if e.response is None or not 400 <= e.response.status_code < 500:
+                        raise
+                    logger.warning("waitForFinish was rejected, falling back to polling")
+                    long_poll = False
+                    continue
+            else:
+                status_data = self.get_run_status(run_id)
+
             status = status_data.get('status')
 
             logger.info(f"Current status: {status} (elapsed: {int(elapsed)}s)")
@@ -148,13 +223,16 @@ class ApifyClient:
 
                 return status_data
 
-            time.sleep(poll_interval)
+            if not long_poll:
+                time.sleep(min(poll_interval * 1.5 ** polls, MAX_POLL_INTERVAL))
+                polls += 1
 
     def get_dataset_items(
         self,
         dataset_id: str,
         format: str = 'json',
-        clean: bool = False
+        clean: bool = False,
+        as_bytes: bool = False
     ) -> List[Dict[str, Any]]:
         """
         Retrieve items from a dataset
@@ -163,15 +241,13 @@ class ApifyClient:
             dataset_id: The dataset ID
             format: Output format (json, csv, etc.)
             clean: Whether to return clean items only
+            as_bytes: For non-JSON formats, return the undecoded body as bytes
 
         Returns:
-            List of dataset items
+            List of dataset items (str or bytes for other formats)
         """
         url = f"{self.base_url}/datasets/{dataset_id}/items"
-        params = {
-            'token': self.api_token,
-            'format': format
-        }
+        params = {**self._auth_params, 'format': format}
 
         if clean:
             params['clean'] = 'true'
@@ -189,18 +265,100 @@ class ApifyClient:
             else:
                 # For CSV or other formats, return raw content
                 logger.info(f"Retrieved dataset in {format} format")
-                return response.text
+                return response.content if as_bytes else response.text
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get dataset items: {e}")
             raise
 
+    def get_dataset_items_iter(
+        self,
+        dataset_id: str,
+        chunk_size: int = 1000,
+        clean: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over dataset items, fetching them in pages of chunk_size
+
+        Only one page is held in memory at a time (less with ijson installed,
+        which parses each page straight off the socket).
+
+        Args:
+            dataset_id: The dataset ID
+            chunk_size: Number of items requested per page
+            clean: Whether to return clean items only
+
+        Yields:
+            Dataset items
+        """
+        url = f"{self.base_url}/datasets/{dataset_id}/items"
+        params = {**self._auth_params, 'format': 'json', 'limit': chunk_size}
+
+        if clean:
+            params['clean'] = 'true'
+
+        logger.info(f"Streaming dataset items from {dataset_id} in pages of {chunk_size}...")
+
+        offset = 0
+        while True:
+            params['offset'] = offset
+
+            try:
+                with self.session.get(url, params=params, timeout=60, stream=True) as response:
+                    response.raise_for_status()
+
+                    if ijson is not None:
+                        # Let urllib3 undo the gzip transfer encoding for ijson
+                        response.raw.decode_content = True
+                        count = 0
+                        for item in ijson.items(response.raw, 'item', use_float=True):
+                            count += 1
+                            yield item
+                    else:
+                        items = response.json()
+                        count = len(items)
+                        yield from items
+
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Failed to get dataset items at offset {offset}: {e}")
+                raise
+
+            offset += count
+            if count < chunk_size:
+                break
+
+        logger.info(f"Retrieved {offset} items from dataset")
+
+    def _run_to_completion(
+        self,
+        actor_id: str,
+        input_data: Dict[str, Any],
+        poll_interval: float,
+        max_wait_time: int
+    ) -> tuple[Dict[str, Any], str]:
+        """Start an actor run and wait for it; returns (final_status, dataset_id) or raises unless it succeeded"""
+        run_data = self.run_actor(actor_id, input_data)
+
+        final_status = self.wait_for_completion(
+            run_data.get('id'),
+            poll_interval=poll_interval,
+            max_wait_time=max_wait_time
+        )
+
+        if final_status.get('status') != 'SUCCEEDED':
+            raise RuntimeError(
+                f"Actor run failed with status: {final_status.get('status')}"
+            )
+
+        return final_status, run_data.get('defaultDatasetId')
+
     def run_and_wait(
         self,
         actor_id: str,
         input_data: Dict[str, Any],
-        poll_interval: int = 5,
-        max_wait_time: int = 3600
+        poll_interval: float = 1,
+        max_wait_time: int = 3600,
+        fetch_items: bool = True
     ) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
         """
         Run an actor and wait for completion, then return the results
@@ -208,53 +366,122 @@ class ApifyClient:
         Args:
             actor_id: The actor ID to run
             input_data: Input parameters for the actor
-            poll_interval: Seconds between status checks
+            poll_interval: Initial seconds between status checks when polling
             max_wait_time: Maximum time to wait in seconds
+            fetch_items: Download the dataset as JSON; pass False when the
+                caller fetches it itself (dataset_items is then empty)
+
+        Identical calls made while a run is in progress (same token, actor and
+        input) wait for that run instead of starting another one.
 
         Returns:
             Tuple of (run_data, dataset_items)
         """
-        # Start the run
-        run_data = self.run_actor(actor_id, input_data)
-        run_id = run_data.get('id')
-        dataset_id = run_data.get('defaultDatasetId')
+        key = (self.api_token, actor_id, json.dumps(input_data, sort_keys=True, default=str), fetch_items)
 
-        # Wait for completion
-        final_status = self.wait_for_completion(
-            run_id,
-            poll_interval=poll_interval,
-            max_wait_time=max_wait_time
-        )
+        with _inflight_lock:
+            future = _inflight_runs.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = _inflight_runs[key] = Future()
 
-        # Get results if successful
-        if final_status.get('status') == 'SUCCEEDED':
-            items = self.get_dataset_items(dataset_id)
-            return final_status, items
-        else:
-            raise RuntimeError(
-                f"Actor run failed with status: {final_status.get('status')}"
+        if not is_owner:
+            logger.info(f"Identical run of actor {actor_id} already in progress, waiting for it")
+            final_status, items = future.result()
+            return final_status, list(items)
+
+        try:
+            final_status, dataset_id = self._run_to_completion(
+                actor_id, input_data, poll_interval, max_wait_time
             )
+            items = self.get_dataset_items(dataset_id) if fetch_items else []
+            future.set_result((final_status, items))
+            return final_status, items
+
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+
+        finally:
+            with _inflight_lock:
+                _inflight_runs.pop(key, None)
+
+    def run_and_iter(
+        self,
+        actor_id: str,
+        input_data: Dict[str, Any],
+        poll_interval: float = 1,
+        max_wait_time: int = 3600,
+        chunk_size: int = 1000
+    ) -> tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """
+        Run an actor and wait for completion, then stream the results page by page
+
+        Args:
+            actor_id: The actor ID to run
+            input_data: Input parameters for the actor
+            poll_interval: Initial seconds between status checks when polling
+            max_wait_time: Maximum time to wait in seconds
+            chunk_size: Number of items fetched per page
+
+        Returns:
+            Tuple of (run_data, dataset item iterator)
+        """
+        final_status, dataset_id = self._run_to_completion(
+            actor_id, input_data, poll_interval, max_wait_time
+        )
+        items = self.get_dataset_items_iter(dataset_id, chunk_size=chunk_size)
+        return final_status, items
 
     def get_actor_info(self, actor_id: str) -> Dict[str, Any]:
         """
         Get information about an actor
 
+        Results are cached per token and actor ID; see clear_actor_cache.
+
         Args:
             actor_id: The actor ID
 
         Returns:
             Actor information
         """
-        url = f"{self.base_url}/acts/{actor_id}"
-        params = {'token': self.api_token}
+        cache_key = (self.api_token, actor_id)
+        cached = _actor_info_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
+        url = f"{self.base_url}/acts/{actor_id}"
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=self._auth_params, timeout=10)
             response.raise_for_status()
 
             result = response.json()
-            return result.get('data', {})
+            info = result.get('data', {})
+            _actor_info_cache[cache_key] = info
+            return info
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get actor info: {e}")
             raise
+
+    @staticmethod
+    def clear_actor_cache():
+        """Forget actor metadata cached by get_actor_info"""
+        _actor_info_cache.clear()
+
+
+@lru_cache(maxsize=4)
+def get_default_client(api_token: Optional[str] = None) -> ApifyClient:
+    """
+    Return a process-wide ApifyClient for the given token
+
+    Scrapers share this instance (and its keep-alive connection pool) unless
+    they are given their own client. Don't close() the returned client.
+
+    Args:
+        api_token: Apify API token. If not provided, reads from APIFY_API_TOKEN env var
+
+    Returns:
+        Shared client
+    """
+    return ApifyClient(api_token)
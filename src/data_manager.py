@@ -3,13 +3,71 @@ Data storage and export functionality for scraped lead data
 """
 import json
 import csv
-from typing import List, Dict, Any, Optional
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from itertools import chain
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Union
 from pathlib import Path
 from datetime import datetime
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional: faster JSON load/save, falls back to json
+
+if orjson is not None:
+    def _dumps(data: Any, pretty: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+
+    _loads = orjson.loads
+else:
+    def _dumps(data: Any, pretty: bool = False) -> bytes:
+        if pretty:
+            text = json.dumps(data, indent=2, ensure_ascii=False)
+        else:
+            text = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+        return text.encode('utf-8')
+
+    _loads = json.loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # Optional: streaming JSON reads in iter_json
+
 logger = logging.getLogger(__name__)
 
+# Fields whose non-empty values are counted by get_summary_stats
+SUMMARY_COUNT_FIELDS = ('email', 'phone', 'phoneNumber', 'companyName', 'location', 'industry')
+
+# Fields whose distinct values are counted by get_summary_stats
+SUMMARY_UNIQUE_FIELDS = ('companyName', 'location', 'industry')
+
+NON_DIGIT_RE = re.compile(r'\D+')
+
+
+def _normalize_email(value: Any) -> str:
+    return str(value).strip().lower()
+
+
+def _normalize_phone(value: Any) -> str:
+    return NON_DIGIT_RE.sub('', str(value))
+
+
+# Canonical forms used by merge_datasets so formatting variants dedupe together
+DEDUP_NORMALIZERS = {
+    'email': _normalize_email,
+    'phone': _normalize_phone,
+    'phoneNumber': _normalize_phone,
+}
+
 
 class DataManager:
     """Manager for storing and exporting scraped data"""
@@ -24,11 +82,24 @@ class DataManager:
         self.output_dir = Path(output_directory)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+    @staticmethod
+    def _resolve_name(filename: Optional[str], include_timestamp: bool) -> str:
+        """Apply the default name and optional timestamp suffix to an export filename"""
+        if filename is None:
+            filename = "scraped_data"
+
+        if include_timestamp:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"{filename}_{timestamp}"
+
+        return filename
+
     def save_json(
         self,
         data: List[Dict[str, Any]],
         filename: Optional[str] = None,
-        include_timestamp: bool = True
+        include_timestamp: bool = True,
+        pretty: bool = False
     ) -> Path:
         """
         Save data to JSON file
@@ -37,23 +108,19 @@ class DataManager:
             data: List of records to save
             filename: Output filename (without extension)
             include_timestamp: Whether to include timestamp in filename
+            pretty: Indent the output for reading; compact by default
 
         Returns:
             Path to saved file
         """
-        if filename is None:
-            filename = "scraped_data"
-
-        if include_timestamp:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{filename}_{timestamp}"
+        filename = self._resolve_name(filename, include_timestamp)
 
         output_path = self.output_dir / f"{filename}.json"
 
         logger.info(f"Saving {len(data)} records to {output_path}")
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'wb') as f:
+            f.write(_dumps(data, pretty))
 
         logger.info(f"Data saved successfully to {output_path}")
         return output_path
@@ -80,22 +147,14 @@ class DataManager:
         if not data:
             raise ValueError("Cannot save empty data to CSV")
 
-        if filename is None:
-            filename = "scraped_data"
-
-        if include_timestamp:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{filename}_{timestamp}"
+        filename = self._resolve_name(filename, include_timestamp)
 
         output_path = self.output_dir / f"{filename}.csv"
 
-        # Determine fieldnames
+        # Determine fieldnames; the key scan is skipped when they are given
         if fieldnames is None:
-            # Collect all unique keys from all records
-            all_keys = set()
-            for record in data:
-                all_keys.update(record.keys())
-            fieldnames = sorted(list(all_keys))
+            # Collect all unique keys from all records in one C-level union
+            fieldnames = sorted(set().union(*data))
 
         logger.info(f"Saving {len(data)} records to {output_path}")
         logger.info(f"CSV columns: {fieldnames}")
@@ -108,11 +167,48 @@ class DataManager:
         logger.info(f"Data saved successfully to {output_path}")
         return output_path
 
+    def save_csv_raw(
+        self,
+        csv_text: Union[str, bytes],
+        filename: Optional[str] = None,
+        include_timestamp: bool = True
+    ) -> Path:
+        """
+        Save CSV text as-is, e.g. a dataset already rendered as CSV by Apify
+
+        Args:
+            csv_text: CSV content to write; bytes are written without decoding
+            filename: Output filename (without extension)
+            include_timestamp: Whether to include timestamp in filename
+
+        Returns:
+            Path to saved file
+        """
+        if not csv_text:
+            raise ValueError("Cannot save empty data to CSV")
+
+        filename = self._resolve_name(filename, include_timestamp)
+
+        output_path = self.output_dir / f"{filename}.csv"
+
+        logger.info(f"Saving raw CSV to {output_path}")
+
+        if isinstance(csv_text, bytes):
+            with open(output_path, 'wb') as f:
+                f.write(csv_text)
+        else:
+            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                f.write(csv_text)
+
+        logger.info(f"Data saved successfully to {output_path}")
+        return output_path
+
     def save_both_formats(
         self,
         data: List[Dict[str, Any]],
         filename: Optional[str] = None,
-        include_timestamp: bool = True
+        include_timestamp: bool = True,
+        pretty: bool = False
     ) -> Dict[str, Path]:
         """
         Save data in both JSON and CSV formats
@@ -121,17 +217,24 @@ class DataManager:
             data: List of records to save
             filename: Output filename (without extension)
             include_timestamp: Whether to include timestamp in filename
+            pretty: Indent the JSON output for reading
 
         Returns:
             Dictionary with paths for both formats
         """
-        json_path = self.save_json(data, filename, include_timestamp)
-        csv_path = self.save_csv(data, filename, include_timestamp)
+        # Resolve the name once so both files share the same timestamp
+        filename = self._resolve_name(filename, include_timestamp)
 
-        return {
-            "json": json_path,
-            "csv": csv_path
-        }
+        # The JSON write is one pre-encoded buffer, so the CSV encoding can run
+        # while it is flushed to disk
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            json_future = executor.submit(self.save_json, data, filename, False, pretty)
+            csv_future = executor.submit(self.save_csv, data, filename, False)
+
+            return {
+                "json": json_future.result(),
+                "csv": csv_future.result()
+            }
 
     def load_json(self, filepath: str) -> List[Dict[str, Any]]:
         """
@@ -146,16 +249,41 @@ class DataManager:
         path = Path(filepath)
         logger.info(f"Loading data from {path}")
 
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(path, 'rb') as f:
+            data = _loads(f.read())
 
         logger.info(f"Loaded {len(data)} records")
         return data
 
+    def iter_json(self, filepath: str) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over the records of a JSON export one at a time
+
+        With ijson installed the file is parsed incrementally, so memory stays
+        flat regardless of file size; otherwise this falls back to load_json
+        and the whole list is loaded first.
+
+        Args:
+            filepath: Path to JSON file
+
+        Yields:
+            Records from the file
+        """
+        if ijson is None:
+            yield from self.load_json(filepath)
+            return
+
+        path = Path(filepath)
+        logger.info(f"Streaming data from {path}")
+
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True)
+
     def merge_datasets(
         self,
         datasets: List[List[Dict[str, Any]]],
-        deduplicate_by: Optional[str] = None
+        deduplicate_by: Optional[str] = None,
+        normalize: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Merge multiple datasets into one
@@ -163,21 +291,28 @@ class DataManager:
         Args:
             datasets: List of datasets to merge
             deduplicate_by: Field to use for deduplication (e.g., 'email')
+            normalize: Compare keys in canonical form (lowercased emails,
+                digits-only phone numbers) for fields in DEDUP_NORMALIZERS
 
         Returns:
             Merged dataset
         """
-        merged = []
-        seen = set()
-
-        for dataset in datasets:
-            for record in dataset:
-                if deduplicate_by:
-                    key = record.get(deduplicate_by)
-                    if key and key in seen:
+        if not deduplicate_by:
+            merged = list(chain.from_iterable(datasets))
+        else:
+            # Single pass: keep the first record per key, records without a key are always kept
+            merged = []
+            seen = set()
+            normalize_key = DEDUP_NORMALIZERS.get(deduplicate_by) if normalize else None
+
+            for record in chain.from_iterable(datasets):
+                key = record.get(deduplicate_by)
+                if key and normalize_key is not None:
+                    key = normalize_key(key)
+                if key:
+                    if key in seen:
                         continue
-                    if key:
-                        seen.add(key)
+                    seen.add(key)
 
                 merged.append(record)
 
@@ -202,59 +337,81 @@ class DataManager:
         Returns:
             Filtered records
         """
+        # Split filters once: cheap equality checks run first, list filters
+        # become sets (keeping the list for unhashable record values)
+        exact = []
+        members = []
+        for field, value in filters.items():
+            if isinstance(value, list):
+                try:
+                    allowed = frozenset(value)
+                except TypeError:
+                    allowed = value
+                members.append((field, allowed, value))
+            else:
+                exact.append((field, value))
+
         filtered = []
 
         for record in data:
-            match = True
-            for field, value in filters.items():
-                if isinstance(value, list):
-                    # Check if record value is in the list
-                    if record.get(field) not in value:
-                        match = False
-                        break
+            get = record.get
+            for field, value in exact:
+                if get(field) != value:
+                    break
+            else:
+                for field, allowed, values in members:
+                    record_value = get(field)
+                    try:
+                        if record_value not in allowed:
+                            break
+                    except TypeError:
+                        if record_value not in values:
+                            break
                 else:
-                    # Exact match
-                    if record.get(field) != value:
-                        match = False
-                        break
-
-            if match:
-                filtered.append(record)
+                    filtered.append(record)
 
         logger.info(f"Filtered {len(data)} records down to {len(filtered)} records")
         return filtered
 
-    def get_summary_stats(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def get_summary_stats(self, data: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Generate summary statistics for a dataset
 
+        Records are visited once, so data may be any iterable (e.g. iter_json).
+
         Args:
-            data: List of records
+            data: Records (list or iterator)
 
         Returns:
             Dictionary with summary statistics
         """
-        if not data:
-            return {"total_records": 0}
+        total = 0
+        counts = dict.fromkeys(SUMMARY_COUNT_FIELDS, 0)
+        unique_values = {field: set() for field in SUMMARY_UNIQUE_FIELDS}
 
-        total = len(data)
+        for record in data:
+            total += 1
+            get = record.get
+            for field in SUMMARY_COUNT_FIELDS:
+                if get(field):
+                    counts[field] += 1
+            for field in SUMMARY_UNIQUE_FIELDS:
+                value = get(field)
+                if value:
+                    unique_values[field].add(value)
+
+        if not total:
+            return {"total_records": 0}
 
-        # Count non-empty values for common fields
-        fields_to_check = ['email', 'phone', 'phoneNumber', 'companyName', 'location', 'industry']
         field_counts = {}
-
-        for field in fields_to_check:
-            count = sum(1 for record in data if record.get(field))
+        for field, count in counts.items():
             if count > 0:
                 field_counts[f"{field}_count"] = count
                 field_counts[f"{field}_rate"] = f"{(count/total*100):.1f}%"
 
-        # Count unique values for certain fields
-        unique_fields = ['companyName', 'location', 'industry']
-        for field in unique_fields:
-            unique_values = set(record.get(field) for record in data if record.get(field))
-            if unique_values:
-                field_counts[f"unique_{field}"] = len(unique_values)
+        for field, values in unique_values.items():
+            if values:
+                field_counts[f"unique_{field}"] = len(values)
 
         return {
             "total_records": total,
@@ -271,5 +428,23 @@ class DataManager:
         Returns:
             List of file paths
         """
-        files = sorted(self.output_dir.glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
-        return files
+        if '/' in pattern or os.sep in pattern:
+            return sorted(self.output_dir.glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
+
+        return [
+            self.output_dir / name
+            for name, _ in self._scan_exports()
+            if fnmatch(name, pattern)
+        ]
+
+    def _scan_exports(self) -> List[tuple]:
+        """
+        Read every export's name and mtime in one directory scan
+
+        Returns:
+            (name, mtime) pairs sorted newest first
+        """
+        with os.scandir(self.output_dir) as entries:
+            scanned = [(entry.name, entry.stat().st_mtime) for entry in entries]
+        scanned.sort(key=itemgetter(1), reverse=True)
+        return scanned
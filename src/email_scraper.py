@@ -2,41 +2,49 @@
 Email scraper using Apify actor T1XDXWc1L92AfIJtd
 Extracts verified emails from organizations
 """
-import yaml
-from typing import List, Dict, Any, Optional
-from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable
 import logging
 
-from .apify_client import ApifyClient
+from ._scraper_base import _ApifyScraperBase, _pct
 
 logger = logging.getLogger(__name__)
 
 
-class EmailScraper:
+class EmailScraper(_ApifyScraperBase):
     """Scraper for extracting verified emails using Apify"""
 
     # Actor ID for verified email extraction
     ACTOR_ID = "T1XDXWc1L92AfIJtd"
 
-    def __init__(self, api_token: Optional[str] = None, config_path: Optional[str] = None):
-        """
-        Initialize email scraper
+    # Section under `actors` in config.yaml
+    CONFIG_KEY = "email_scraper"
 
-        Args:
-            api_token: Apify API token
-            config_path: Path to config.yaml file
-        """
-        self.client = ApifyClient(api_token)
+    __slots__ = ()
 
-        # Load configuration
-        if config_path is None:
-            config_path = Path(__file__).parent.parent / "config" / "config.yaml"
+    def _build_input(
+        self,
+        organization_locations: List[str],
+        max_results: int = 100,
+        get_emails: bool = True,
+        include_risky_emails: bool = True,
+        additional_params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build (and log) the actor input shared by scrape() and iter_results()"""
+        input_data = {
+            "getEmails": get_emails,
+            "includeRiskyEmails": include_risky_emails,
+            "maxResults": max_results,
+            "organizationLocations": organization_locations
+        }
+
+        # Merge with additional parameters if provided
+        if additional_params:
+            input_data.update(additional_params)
 
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        logger.info("Starting email scraper for locations: %s", organization_locations)
+        logger.info("Max results: %s", max_results)
 
-        self.actor_config = self.config['actors']['email_scraper']
-        self.api_config = self.config['api']
+        return input_data
 
     def scrape(
         self,
@@ -44,7 +52,8 @@ class EmailScraper:
         max_results: int = 100,
         get_emails: bool = True,
         include_risky_emails: bool = True,
-        additional_params: Optional[Dict[str, Any]] = None
+        additional_params: Optional[Dict[str, Any]] = None,
+        fetch_items: bool = True
     ) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
         """
         Scrape verified emails from organizations
@@ -55,34 +64,31 @@ class EmailScraper:
             get_emails: Whether to extract emails
             include_risky_emails: Whether to include risky/unverified emails
             additional_params: Additional parameters to pass to the actor
+            fetch_items: Download the results; pass False to only run the actor
+                (results is then empty and the dataset is fetched separately)
 
         Returns:
             Tuple of (run_data, results)
         """
-        # Build input parameters
-        input_data = {
-            "getEmails": get_emails,
-            "includeRiskyEmails": include_risky_emails,
-            "maxResults": max_results,
-            "organizationLocations": organization_locations
-        }
-
-        # Merge with additional parameters if provided
-        if additional_params:
-            input_data.update(additional_params)
-
-        logger.info(f"Starting email scraper for locations: {organization_locations}")
-        logger.info(f"Max results: {max_results}")
+        input_data = self._build_input(
+            organization_locations,
+            max_results=max_results,
+            get_emails=get_emails,
+            include_risky_emails=include_risky_emails,
+            additional_params=additional_params
+        )
 
         # Run the actor and wait for completion
         run_data, results = self.client.run_and_wait(
             actor_id=self.ACTOR_ID,
             input_data=input_data,
-            poll_interval=self.api_config['poll_interval'],
-            max_wait_time=self.api_config['timeout']
+            poll_interval=self._poll_interval,
+            max_wait_time=self._timeout,
+            fetch_items=fetch_items
         )
 
-        logger.info(f"Email scraping completed. Retrieved {len(results)} records")
+        if fetch_items:
+            logger.info("Email scraping completed. Retrieved %d records", len(results))
 
         return run_data, results
 
@@ -152,33 +158,38 @@ class EmailScraper:
         )
 
     @staticmethod
-    def extract_email_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def extract_email_summary(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Extract summary statistics from email scraping results
 
         Args:
-            results: List of result records
+            results: Result records (list, or the iterator from iter_results)
 
         Returns:
             Dictionary with summary statistics
         """
-        total_records = len(results)
+        total_records = 0
         emails_found = 0
         companies = set()
         locations = set()
 
+        # One lookup per field per record
         for record in results:
-            if record.get('email'):
+            total_records += 1
+            get = record.get
+            if get('email'):
                 emails_found += 1
-            if record.get('companyName'):
-                companies.add(record.get('companyName'))
-            if record.get('location'):
-                locations.add(record.get('location'))
+            company = get('companyName')
+            if company:
+                companies.add(company)
+            location = get('location')
+            if location:
+                locations.add(location)
 
         return {
             "total_records": total_records,
             "emails_found": emails_found,
             "unique_companies": len(companies),
             "unique_locations": len(locations),
-            "email_rate": f"{(emails_found/total_records*100):.1f}%" if total_records > 0 else "0%"
+            "email_rate": _pct(emails_found, total_records)
         }
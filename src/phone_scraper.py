@@ -2,43 +2,31 @@
 Phone scraper using Apify actor aihL2lJmGDt9XFCGg
 Extracts phone numbers and company information
 """
-import yaml
-from typing import List, Dict, Any, Optional
-from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable
 import logging
 
-from .apify_client import ApifyClient
+from ._scraper_base import _ApifyScraperBase, _pct
 
 logger = logging.getLogger(__name__)
 
 
-class PhoneScraper:
+def _normalize(value: Any) -> str:
+    """Lowercase and collapse whitespace so field values compare exactly"""
+    return ' '.join(str(value).lower().split())
+
+
+class PhoneScraper(_ApifyScraperBase):
     """Scraper for extracting phone numbers and company data using Apify"""
 
     # Actor ID for phone number extraction
     ACTOR_ID = "aihL2lJmGDt9XFCGg"
 
-    def __init__(self, api_token: Optional[str] = None, config_path: Optional[str] = None):
-        """
-        Initialize phone scraper
-
-        Args:
-            api_token: Apify API token
-            config_path: Path to config.yaml file
-        """
-        self.client = ApifyClient(api_token)
+    # Section under `actors` in config.yaml
+    CONFIG_KEY = "phone_scraper"
 
-        # Load configuration
-        if config_path is None:
-            config_path = Path(__file__).parent.parent / "config" / "config.yaml"
+    __slots__ = ()
 
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
-
-        self.actor_config = self.config['actors']['phone_scraper']
-        self.api_config = self.config['api']
-
-    def scrape(
+    def _build_input(
         self,
         organization_locations: List[str],
         industries: Optional[List[str]] = None,
@@ -49,24 +37,8 @@ class PhoneScraper:
         get_emails: bool = True,
         include_risky_emails: bool = True,
         additional_params: Optional[Dict[str, Any]] = None
-    ) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
-        """
-        Scrape phone numbers and company information
-
-        Args:
-            organization_locations: List of location names (e.g., ["dubai", "chennai"])
-            industries: List of industry names (e.g., ["software", "technology"])
-            company_types: List of company types (e.g., ["PRIVATE", "PUBLIC"])
-            employee_size_min: Minimum employee count
-            employee_size_max: Maximum employee count (optional)
-            max_results: Maximum number of results to return
-            get_emails: Whether to also extract emails
-            include_risky_emails: Whether to include risky/unverified emails
-            additional_params: Additional parameters to pass to the actor
-
-        Returns:
-            Tuple of (run_data, results)
-        """
+    ) -> Dict[str, Any]:
+        """Build (and log) the actor input shared by scrape() and iter_results()"""
         # Build input parameters with defaults
         input_data = {
             "companyTypes": company_types or ["PRIVATE"],
@@ -88,20 +60,68 @@ class PhoneScraper:
         if additional_params:
             input_data.update(additional_params)
 
-        logger.info(f"Starting phone scraper for locations: {organization_locations}")
+        logger.info("Starting phone scraper for locations: %s", organization_locations)
         if industries:
-            logger.info(f"Industries: {industries}")
-        logger.info(f"Max results: {max_results}")
+            logger.info("Industries: %s", industries)
+        logger.info("Max results: %s", max_results)
+
+        return input_data
+
+    def scrape(
+        self,
+        organization_locations: List[str],
+        industries: Optional[List[str]] = None,
+        company_types: Optional[List[str]] = None,
+        employee_size_min: int = 0,
+        employee_size_max: Optional[int] = None,
+        max_results: int = 100,
+        get_emails: bool = True,
+        include_risky_emails: bool = True,
+        additional_params: Optional[Dict[str, Any]] = None,
+        fetch_items: bool = True
+    ) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Scrape phone numbers and company information
+
+        Args:
+            organization_locations: List of location names (e.g., ["dubai", "chennai"])
+            industries: List of industry names (e.g., ["software", "technology"])
+            company_types: List of company types (e.g., ["PRIVATE", "PUBLIC"])
+            employee_size_min: Minimum employee count
+            employee_size_max: Maximum employee count (optional)
+            max_results: Maximum number of results to return
+            get_emails: Whether to also extract emails
+            include_risky_emails: Whether to include risky/unverified emails
+            additional_params: Additional parameters to pass to the actor
+            fetch_items: Download the results; pass False to only run the actor
+                (results is then empty and the dataset is fetched separately)
+
+        Returns:
+            Tuple of (run_data, results)
+        """
+        input_data = self._build_input(
+            organization_locations,
+            industries=industries,
+            company_types=company_types,
+            employee_size_min=employee_size_min,
+            employee_size_max=employee_size_max,
+            max_results=max_results,
+            get_emails=get_emails,
+            include_risky_emails=include_risky_emails,
+            additional_params=additional_params
+        )
 
         # Run the actor and wait for completion
         run_data, results = self.client.run_and_wait(
             actor_id=self.ACTOR_ID,
             input_data=input_data,
-            poll_interval=self.api_config['poll_interval'],
-            max_wait_time=self.api_config['timeout']
+            poll_interval=self._poll_interval,
+            max_wait_time=self._timeout,
+            fetch_items=fetch_items
         )
 
-        logger.info(f"Phone scraping completed. Retrieved {len(results)} records")
+        if fetch_items:
+            logger.info("Phone scraping completed. Retrieved %d records", len(results))
 
         return run_data, results
 
@@ -184,35 +204,124 @@ class PhoneScraper:
             **kwargs
         )
 
+    def scrape_many(
+        self,
+        specs: Dict[str, Dict[str, Any]],
+        **kwargs
+    ) -> tuple[Dict[str, Any], Dict[str, List[Dict[str, Any]]]]:
+        """
+        Run several location/industry queries as a single actor run
+
+        The locations and industries of all specs are combined into one input
+        (maxResults is the sum of the specs' max_results), so the actor is
+        started once instead of once per spec. Records are then assigned back
+        to every spec they match, up to that spec's own max_results:
+
+        - a spec location matches the record's whole location, or one of its
+          comma-separated parts ("Dubai" matches "Dubai, United Arab Emirates")
+        - a spec industry must equal the record's industry
+
+        Comparisons are case- and whitespace-insensitive but otherwise exact.
+        The shared run has one overall cap, so a broad spec can use up results
+        that separate runs would have returned for the others. Per-spec
+        counts can therefore come back lower than a per-spec run would give.
+
+        Args:
+            specs: Spec ID -> {"organization_locations": [...], "industries": [...],
+                "max_results": int}; industries and max_results are optional
+            **kwargs: Additional parameters passed to scrape()
+
+        Returns:
+            Tuple of (run_data, {spec ID: matching records})
+        """
+        locations = []
+        industries = []
+        filter_industries = True
+        max_results = 0
+
+        for spec in specs.values():
+            for location in spec['organization_locations']:
+                if location not in locations:
+                    locations.append(location)
+            if spec.get('industries'):
+                for industry in spec['industries']:
+                    if industry not in industries:
+                        industries.append(industry)
+            else:
+                # A spec without industries needs results from every industry
+                filter_industries = False
+            max_results += spec.get('max_results', 100)
+
+        run_data, results = self.scrape(
+            organization_locations=locations,
+            industries=industries if filter_industries else None,
+            max_results=max_results,
+            **kwargs
+        )
+
+        matchers = {
+            spec_id: (
+                {_normalize(location) for location in spec['organization_locations']},
+                {_normalize(industry) for industry in spec.get('industries') or ()},
+                spec.get('max_results', 100)
+            )
+            for spec_id, spec in specs.items()
+        }
+        partitioned = {spec_id: [] for spec_id in specs}
+
+        for record in results:
+            location = record.get('location') or ''
+            location_parts = {_normalize(location)}
+            location_parts.update(_normalize(part) for part in location.split(','))
+            industry = _normalize(record.get('industry') or '')
+
+            for spec_id, (spec_locations, spec_industries, spec_max) in matchers.items():
+                matched = partitioned[spec_id]
+                if len(matched) >= spec_max:
+                    continue
+                if spec_locations.isdisjoint(location_parts):
+                    continue
+                if spec_industries and industry not in spec_industries:
+                    continue
+                matched.append(record)
+
+        return run_data, partitioned
+
     @staticmethod
-    def extract_phone_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def extract_phone_summary(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Extract summary statistics from phone scraping results
 
         Args:
-            results: List of result records
+            results: Result records (list, or the iterator from iter_results)
 
         Returns:
             Dictionary with summary statistics
         """
-        total_records = len(results)
+        total_records = 0
         phones_found = 0
         emails_found = 0
         companies = set()
         locations = set()
         industries = set()
 
+        # One lookup per field per record
         for record in results:
-            if record.get('phone') or record.get('phoneNumber'):
+            total_records += 1
+            get = record.get
+            if get('phone') or get('phoneNumber'):
                 phones_found += 1
-            if record.get('email'):
+            if get('email'):
                 emails_found += 1
-            if record.get('companyName'):
-                companies.add(record.get('companyName'))
-            if record.get('location'):
-                locations.add(record.get('location'))
-            if record.get('industry'):
-                industries.add(record.get('industry'))
+            company = get('companyName')
+            if company:
+                companies.add(company)
+            location = get('location')
+            if location:
+                locations.add(location)
+            industry = get('industry')
+            if industry:
+                industries.add(industry)
 
         return {
             "total_records": total_records,
@@ -221,6 +330,6 @@ class PhoneScraper:
             "unique_companies": len(companies),
             "unique_locations": len(locations),
             "unique_industries": len(industries),
-            "phone_rate": f"{(phones_found/total_records*100):.1f}%" if total_records > 0 else "0%",
-            "email_rate": f"{(emails_found/total_records*100):.1f}%" if total_records > 0 else "0%"
+            "phone_rate": _pct(phones_found, total_records),
+            "email_rate": _pct(emails_found, total_records)
         }
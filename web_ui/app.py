@@ -2,85 +2,277 @@
 Flask web UI for email campaign management
 """
 from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+from werkzeug.exceptions import RequestEntityTooLarge
 from datetime import datetime
 import sys
 from pathlib import Path
+from typing import Optional, Tuple, Dict
 from werkzeug.utils import secure_filename
+from jinja2 import FileSystemBytecodeCache
+import hashlib
+import logging
 import os
+import shutil
+import time
+import uuid
+from collections import namedtuple
+from functools import lru_cache
+from itertools import chain
+from sqlalchemy import event, func, select, tuple_
+from sqlalchemy.orm import Session, load_only, raiseload
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from database.session import get_session
-from database.models import EmailCampaign, EmailTemplate, EmailQueue, SalesLead
+from database.session import ScopedSession
+from database.models import EmailCampaign, EmailTemplate, EmailQueue, SalesLead, LeadSource
 from email_service.campaign_manager import CampaignManager
+from web_ui.jobs import Job, submit_job, get_job
+
+logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-change-this'  # Change in production
 
+# Compiled templates stay in jinja_env's in-memory cache and are only re-checked
+# for changes when app.debug is on (TEMPLATES_AUTO_RELOAD is left at None). The
+# bytecode cache lets new worker processes skip compiling them again.
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+# Reject request bodies over MAX_UPLOAD_MB before reading them. Uploaded files
+# larger than 500 KB are spooled to a temp file by Werkzeug, not held in memory.
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', 100)) * 1024 * 1024
+
+# Chunk size for copying uploads to data/uploads (Werkzeug's default is 16 KB)
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
+
+def _save_upload(file, filepath: Path, hasher=None) -> int:
+    """
+    Copy an uploaded file to filepath in UPLOAD_BUFFER_SIZE chunks
+
+    Args:
+        file: Uploaded FileStorage
+        filepath: Destination path
+        hasher: Optional hashlib object fed the same chunks, so the content
+            hash costs no second read of the file
+
+    Returns:
+        Bytes written
+    """
+    with open(filepath, 'wb', buffering=UPLOAD_BUFFER_SIZE) as out:
+        if hasher is None:
+            shutil.copyfileobj(file.stream, out, UPLOAD_BUFFER_SIZE)
+        else:
+            while True:
+                chunk = file.stream.read(UPLOAD_BUFFER_SIZE)
+                if not chunk:
+                    break
+                out.write(chunk)
+                hasher.update(chunk)
+        return out.tell()
+
+
+def _list_options():
+    """
+    Loader options for queries whose rows are rendered in a list
+
+    The list templates only read columns. In debug mode a relationship access
+    raises instead of quietly issuing one lazy-load query per row; add a
+    selectinload() for the relationship if a template needs it.
+    """
+    return (raiseload('*'),) if app.debug else ()
+
+
+# Rows per page on the campaign and template lists
+LIST_PAGE_SIZE = 50
+
+
+def _encode_cursor(row) -> str:
+    """Page cursor for a row: its created_at and id"""
+    return f"{row.created_at.isoformat()}_{row.id}"
 
-@app.route('/')
-def index():
-    """Dashboard home"""
-    session = get_session()
 
+def _decode_cursor(value: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Parse a cursor from the query string; None if missing or malformed"""
+    if not value:
+        return None
     try:
-        # Get stats
-        total_campaigns = session.query(EmailCampaign).filter(
-            EmailCampaign.is_deleted == False
-        ).count()
+        created_at, row_id = value.rsplit('_', 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
+        return None
 
-        total_leads = session.query(SalesLead).filter(
-            SalesLead.is_deleted == False
-        ).count()
 
-        total_emails_sent = session.query(EmailQueue).filter(
-            EmailQueue.status == 'sent'
-        ).count()
+def _keyset_page(query, model, per_page: int = LIST_PAGE_SIZE):
+    """
+    Fetch one newest-first page of query, keyed on (created_at, id)
+
+    ?after=<cursor> continues with older rows and ?before=<cursor> goes back
+    to newer ones. Each page is an index seek past the cursor, so later pages
+    cost the same as the first instead of scanning an ever larger OFFSET.
+
+    Returns:
+        Tuple of (rows, newer_cursor, older_cursor); a cursor is None when
+        there are no rows in that direction
+    """
+    key = tuple_(model.created_at, model.id)
+    before = _decode_cursor(request.args.get('before'))
+    after = _decode_cursor(request.args.get('after'))
+
+    if before:
+        # Read upwards from the cursor, then flip back to newest-first
+        rows = query.filter(key > before).order_by(
+            model.created_at, model.id
+        ).limit(per_page + 1).all()
+
+        if len(rows) > per_page:
+            rows = rows[:per_page][::-1]
+            return rows, _encode_cursor(rows[0]), _encode_cursor(rows[-1])
+
+        # Fewer than a full page of newer rows: that is the first page
+        after = None
+
+    if after:
+        query = query.filter(key < after)
+
+    rows = query.order_by(
+        model.created_at.desc(), model.id.desc()
+    ).limit(per_page + 1).all()
+
+    older = _encode_cursor(rows[per_page - 1]) if len(rows) > per_page else None
+    rows = rows[:per_page]
+    newer = _encode_cursor(rows[0]) if after and rows else None
+
+    return rows, newer, older
+
+
+# Template dropdown on the campaign form: (id, name, template_type) of active
+# templates, cached until a template change is committed in this process or
+# TEMPLATE_CHOICES_TTL seconds pass (templates can also be created by the CLI)
+TEMPLATE_CHOICES_TTL = 60
+TemplateChoice = namedtuple('TemplateChoice', ['id', 'name', 'template_type'])
+_template_choices_version = 0
+
+
+@event.listens_for(Session, 'after_flush')
+def _note_template_changes(session, flush_context):
+    if any(isinstance(obj, EmailTemplate) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.info['email_templates_changed'] = True
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_template_choices_version(session):
+    global _template_choices_version
+    if session.info.pop('email_templates_changed', False):
+        _template_choices_version += 1
 
-        pending_emails = session.query(EmailQueue).filter(
-            EmailQueue.status == 'pending'
-        ).count()
 
-        # Recent campaigns
-        recent_campaigns = session.query(EmailCampaign).filter(
+@event.listens_for(Session, 'after_rollback')
+def _forget_template_changes(session):
+    session.info.pop('email_templates_changed', None)
+
+
+def _active_template_choices() -> Tuple[TemplateChoice, ...]:
+    """Active templates for the campaign form's dropdowns"""
+    return _load_template_choices(_template_choices_version, int(time.monotonic() // TEMPLATE_CHOICES_TTL))
+
+
+@lru_cache(maxsize=1)
+def _load_template_choices(version: int, ttl_bucket: int) -> Tuple[TemplateChoice, ...]:
+    """Query the dropdown choices; the arguments only key the cache"""
+    rows = ScopedSession().query(
+        EmailTemplate.id, EmailTemplate.name, EmailTemplate.template_type
+    ).filter(
+        EmailTemplate.is_deleted == False,
+        EmailTemplate.is_active == True
+    ).all()
+
+    return tuple(TemplateChoice(*row) for row in rows)
+
+
+@app.teardown_appcontext
+def remove_session(exception=None):
+    """Close the request's database session; uncommitted work is rolled back"""
+    ScopedSession.remove()
+
+
+@app.errorhandler(RequestEntityTooLarge)
+def upload_too_large(e):
+    """Send oversized uploads back to the form with a message instead of a bare 413"""
+    flash(f'Upload is larger than the {app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024)} MB limit', 'danger')
+    return redirect(request.url)
+
+
+@app.route('/')
+def index():
+    """Dashboard home"""
+    session = ScopedSession()
+
+    # Get stats: campaign and lead totals in one SELECT, queue counts in one grouped query
+    total_campaigns, total_leads = session.query(
+        select(func.count(EmailCampaign.id)).where(
             EmailCampaign.is_deleted == False
-        ).order_by(EmailCampaign.created_at.desc()).limit(5).all()
-
-        return render_template(
-            'dashboard.html',
-            total_campaigns=total_campaigns,
-            total_leads=total_leads,
-            total_emails_sent=total_emails_sent,
-            pending_emails=pending_emails,
-            recent_campaigns=recent_campaigns
+        ).scalar_subquery(),
+        select(func.count(SalesLead.id)).where(
+            SalesLead.is_deleted == False
+        ).scalar_subquery()
+    ).one()
+
+    queue_counts = dict(
+        session.query(EmailQueue.status, func.count(EmailQueue.id)).filter(
+            EmailQueue.status.in_(('sent', 'pending'))
+        ).group_by(EmailQueue.status).all()
+    )
+    total_emails_sent = queue_counts.get('sent', 0)
+    pending_emails = queue_counts.get('pending', 0)
+
+    # Recent campaigns (only the columns the dashboard shows)
+    recent_campaigns = session.query(EmailCampaign).options(
+        *_list_options(),
+        load_only(
+            EmailCampaign.id, EmailCampaign.name, EmailCampaign.status,
+            EmailCampaign.total_recipients, EmailCampaign.emails_sent,
+            EmailCampaign.created_at
         )
+    ).filter(
+        EmailCampaign.is_deleted == False
+    ).order_by(EmailCampaign.created_at.desc()).limit(5).all()
 
-    finally:
-        session.close()
+    return render_template(
+        'dashboard.html',
+        total_campaigns=total_campaigns,
+        total_leads=total_leads,
+        total_emails_sent=total_emails_sent,
+        pending_emails=pending_emails,
+        recent_campaigns=recent_campaigns
+    )
 
 
 @app.route('/templates')
 def templates():
     """List email templates"""
-    session = get_session()
+    session = ScopedSession()
 
-    try:
-        templates = session.query(EmailTemplate).filter(
-            EmailTemplate.is_deleted == False
-        ).order_by(EmailTemplate.created_at.desc()).all()
-
-        return render_template('templates.html', templates=templates)
+    query = session.query(EmailTemplate).options(
+        *_list_options(),
+        load_only(
+            EmailTemplate.id, EmailTemplate.name, EmailTemplate.template_type,
+            EmailTemplate.subject, EmailTemplate.is_active, EmailTemplate.created_at
+        )
+    ).filter(
+        EmailTemplate.is_deleted == False
+    )
+    templates, newer, older = _keyset_page(query, EmailTemplate)
 
-    finally:
-        session.close()
+    return render_template('templates.html', templates=templates, newer=newer, older=older)
 
 
 @app.route('/templates/create', methods=['GET', 'POST'])
 def create_template():
     """Create email template"""
     if request.method == 'POST':
-        session = get_session()
+        session = ScopedSession()
 
         try:
             manager = CampaignManager(session=session)
@@ -101,37 +293,30 @@ def create_template():
             flash(f'Error creating template: {e}', 'danger')
             return redirect(url_for('create_template'))
 
-        finally:
-            session.close()
-
     return render_template('create_template.html', template=None)
 
 
 @app.route('/templates/<int:template_id>')
 def view_template(template_id):
     """View email template details"""
-    session = get_session()
+    session = ScopedSession()
 
-    try:
-        template = session.query(EmailTemplate).filter(
-            EmailTemplate.id == template_id,
-            EmailTemplate.is_deleted == False
-        ).first()
-
-        if not template:
-            flash('Template not found', 'danger')
-            return redirect(url_for('templates'))
+    template = session.query(EmailTemplate).filter(
+        EmailTemplate.id == template_id,
+        EmailTemplate.is_deleted == False
+    ).first()
 
-        return render_template('view_template.html', template=template)
+    if not template:
+        flash('Template not found', 'danger')
+        return redirect(url_for('templates'))
 
-    finally:
-        session.close()
+    return render_template('view_template.html', template=template)
 
 
 @app.route('/templates/<int:template_id>/edit', methods=['GET', 'POST'])
 def edit_template(template_id):
     """Edit email template"""
-    session = get_session()
+    session = ScopedSession()
 
     if request.method == 'POST':
         try:
@@ -159,46 +344,43 @@ def edit_template(template_id):
             flash(f'Error updating template: {e}', 'danger')
             return redirect(url_for('edit_template', template_id=template_id))
 
-        finally:
-            session.close()
-
     # GET: Show edit form
-    try:
-        template = session.query(EmailTemplate).filter(
-            EmailTemplate.id == template_id,
-            EmailTemplate.is_deleted == False
-        ).first()
-
-        if not template:
-            flash('Template not found', 'danger')
-            return redirect(url_for('templates'))
+    template = session.query(EmailTemplate).filter(
+        EmailTemplate.id == template_id,
+        EmailTemplate.is_deleted == False
+    ).first()
 
-        return render_template('create_template.html', template=template, is_edit=True)
+    if not template:
+        flash('Template not found', 'danger')
+        return redirect(url_for('templates'))
 
-    finally:
-        session.close()
+    return render_template('create_template.html', template=template, is_edit=True)
 
 
 @app.route('/campaigns')
 def campaigns():
     """List campaigns"""
-    session = get_session()
-
-    try:
-        campaigns = session.query(EmailCampaign).filter(
-            EmailCampaign.is_deleted == False
-        ).order_by(EmailCampaign.created_at.desc()).all()
+    session = ScopedSession()
+
+    query = session.query(EmailCampaign).options(
+        *_list_options(),
+        load_only(
+            EmailCampaign.id, EmailCampaign.name, EmailCampaign.status,
+            EmailCampaign.total_recipients, EmailCampaign.emails_sent,
+            EmailCampaign.created_at
+        )
+    ).filter(
+        EmailCampaign.is_deleted == False
+    )
+    campaigns, newer, older = _keyset_page(query, EmailCampaign)
 
-        return render_template('campaigns.html', campaigns=campaigns)
-
-    finally:
-        session.close()
+    return render_template('campaigns.html', campaigns=campaigns, newer=newer, older=older)
 
 
 @app.route('/campaigns/create', methods=['GET', 'POST'])
 def create_campaign():
     """Create campaign"""
-    session = get_session()
+    session = ScopedSession()
 
     if request.method == 'POST':
         try:
@@ -216,23 +398,21 @@ def create_campaign():
             # Handle attachments
             attachments_data = []
             if 'attachments' in request.files:
-                import os
-                from werkzeug.utils import secure_filename
-                from pathlib import Path
-                
                 upload_dir = Path('data/uploads')
                 upload_dir.mkdir(parents=True, exist_ok=True)
                 
                 files = request.files.getlist('attachments')
                 for file in files:
                     if file.filename:
+                        # Stored under a unique name so campaigns can't overwrite
+                        # each other's files; 'filename' keeps the name recipients see
                         filename = secure_filename(file.filename)
-                        filepath = upload_dir / filename
-                        file.save(str(filepath))
+                        filepath = upload_dir / f'{uuid.uuid4().hex}_{filename}'
+                        size = _save_upload(file, filepath)
                         attachments_data.append({
                             'filename': filename,
                             'path': str(filepath),
-                            'size': filepath.stat().st_size
+                            'size': size
                         })
 
             # Validate sender email (check if it's in allowed list)
@@ -268,97 +448,126 @@ def create_campaign():
             flash(f'Error creating campaign: {e}', 'danger')
             return redirect(url_for('create_campaign'))
 
-        finally:
-            session.close()
-
     # GET: Show form
-    try:
-        templates = session.query(EmailTemplate).filter(
-            EmailTemplate.is_deleted == False,
-            EmailTemplate.is_active == True
-        ).all()
-
-        return render_template('create_campaign.html', templates=templates)
-
-    finally:
-        session.close()
+    return render_template('create_campaign.html', templates=_active_template_choices())
 
 
 @app.route('/campaigns/<int:campaign_id>')
 def campaign_detail(campaign_id):
     """Campaign details and stats"""
-    session = get_session()
-
-    try:
-        campaign = session.query(EmailCampaign).filter(
-            EmailCampaign.id == campaign_id,
-            EmailCampaign.is_deleted == False
-        ).first()
-
-        if not campaign:
-            flash('Campaign not found', 'danger')
-            return redirect(url_for('campaigns'))
-
-        manager = CampaignManager(session=session)
-        stats = manager.get_campaign_stats(campaign_id)
-
-        # Get queue items
-        queue_items = session.query(EmailQueue).filter(
-            EmailQueue.campaign_id == campaign_id
-        ).order_by(EmailQueue.created_at.desc()).limit(50).all()
-
-        # Calculate pending count
-        pending_count = session.query(EmailQueue).filter(
-            EmailQueue.campaign_id == campaign_id,
-            EmailQueue.status == 'pending'
-        ).count()
-
-        # Add campaign_id and pending count to stats
-        stats['id'] = campaign_id
-        stats['emails_pending'] = pending_count
-
-        return render_template(
-            'campaign_detail.html',
-            stats=stats,
-            queue_items=queue_items,
-            campaign=campaign
+    session = ScopedSession()
+
+    campaign = session.query(EmailCampaign).filter(
+        EmailCampaign.id == campaign_id,
+        EmailCampaign.is_deleted == False
+    ).first()
+
+    if not campaign:
+        flash('Campaign not found', 'danger')
+        return redirect(url_for('campaigns'))
+
+    manager = CampaignManager(session=session)
+    stats = manager.get_campaign_stats(campaign_id)
+
+    # Get queue items
+    queue_items = session.query(EmailQueue).options(
+        *_list_options(),
+        load_only(
+            EmailQueue.id, EmailQueue.recipient_email, EmailQueue.status,
+            EmailQueue.created_at, EmailQueue.sent_at
         )
-
-    finally:
-        session.close()
+    ).filter(
+        EmailQueue.campaign_id == campaign_id
+    ).order_by(EmailQueue.created_at.desc()).limit(50).all()
+
+    # Add campaign_id and pending count to stats
+    stats['id'] = campaign_id
+    stats['emails_pending'] = _queue_status_counts(session, campaign_id).get('pending', 0)
+
+    return render_template(
+        'campaign_detail.html',
+        stats=stats,
+        queue_items=queue_items,
+        campaign=campaign
+    )
+
+
+def _queue_status_counts(session: Session, campaign_id: int) -> Dict[str, int]:
+    """Queue item count per status for a campaign, in one grouped query"""
+    rows = session.execute(
+        select(EmailQueue.status, func.count())
+        .where(EmailQueue.campaign_id == campaign_id)
+        .group_by(EmailQueue.status)
+    ).all()
+    return {status: count for status, count in rows}
+
+
+@app.route('/campaigns/<int:campaign_id>/stats.json')
+def campaign_stats_json(campaign_id):
+    """Campaign counters and queue status counts, for polling clients"""
+    session = ScopedSession()
+
+    campaign = session.query(EmailCampaign).options(
+        load_only(
+            EmailCampaign.id, EmailCampaign.name, EmailCampaign.status,
+            EmailCampaign.total_recipients, EmailCampaign.emails_sent,
+            EmailCampaign.emails_failed, EmailCampaign.emails_opened,
+            EmailCampaign.emails_clicked
+        )
+    ).filter(
+        EmailCampaign.id == campaign_id,
+        EmailCampaign.is_deleted == False
+    ).first()
+
+    if not campaign:
+        return jsonify({'error': 'Campaign not found'}), 404
+
+    return jsonify({
+        'id': campaign.id,
+        'name': campaign.name,
+        'status': campaign.status,
+        'total_recipients': campaign.total_recipients or 0,
+        'emails_sent': campaign.emails_sent or 0,
+        'emails_failed': campaign.emails_failed or 0,
+        'emails_opened': campaign.emails_opened or 0,
+        'emails_clicked': campaign.emails_clicked or 0,
+        'queue': _queue_status_counts(session, campaign_id)
+    })
 
 
 @app.route('/campaigns/<int:campaign_id>/queue', methods=['POST'])
 def queue_campaign(campaign_id):
-    """Queue emails for a campaign"""
-    session = get_session()
+    """Queue emails for a campaign in the background"""
+    from_latest_run = request.form.get('from_latest_run') == 'on'
+    limit = int(request.form.get('limit', 100))
 
-    try:
-        manager = CampaignManager(session=session)
+    job = submit_job(
+        'queue_campaign', _queue_campaign_job, campaign_id, from_latest_run, limit,
+        next_url=url_for('campaign_detail', campaign_id=campaign_id)
+    )
+
+    return redirect(url_for('job_status', job_id=job.id))
 
-        from_latest_run = request.form.get('from_latest_run') == 'on'
-        limit = int(request.form.get('limit', 100))
 
+def _queue_campaign_job(job: Job, campaign_id: int, from_latest_run: bool, limit: int) -> Dict[str, str]:
+    """Background part of queue_campaign; runs with its own session"""
+    manager = CampaignManager()
+
+    try:
         if from_latest_run:
             count = manager.queue_from_latest_run(campaign_id, limit=limit)
         else:
             count = manager.queue_campaign(campaign_id)
-
-        flash(f'Queued {count} emails successfully!', 'success')
-
-    except Exception as e:
-        flash(f'Error queuing emails: {e}', 'danger')
-
     finally:
-        session.close()
+        manager.close()
 
-    return redirect(url_for('campaign_detail', campaign_id=campaign_id))
+    return {'category': 'success', 'message': f'Queued {count} emails successfully!'}
 
 
 @app.route('/campaigns/<int:campaign_id>/send', methods=['POST'])
 def send_campaign_emails(campaign_id):
     """Process and send pending emails for a campaign"""
-    session = get_session()
+    session = ScopedSession()
 
     try:
         from email_service.queue_processor import QueueProcessor
@@ -377,11 +586,11 @@ def send_campaign_emails(campaign_id):
         provider_type = campaign.email_provider or 'smtp'
         
         # Create provider with campaign's SMTP settings if available
-        from email_service.providers import get_provider, SMTPProvider
+        from email_service.providers import get_provider, get_smtp_provider
         
         if provider_type == 'smtp' and campaign.smtp_host:
-            # Use campaign-specific SMTP settings
-            provider = SMTPProvider(
+            # Use campaign-specific SMTP settings (shared connection per account)
+            provider = get_smtp_provider(
                 host=campaign.smtp_host,
                 port=campaign.smtp_port or 587,
                 username=campaign.smtp_username or campaign.sender_email,
@@ -409,14 +618,7 @@ def send_campaign_emails(campaign_id):
             EmailQueue.is_deleted == False
         ).order_by(EmailQueue.scheduled_at).limit(int(request.form.get('batch_size', 10))).all()
 
-        sent_count = 0
-        failed_count = 0
-
-        for email in pending_emails:
-            if processor.send_email(email):
-                sent_count += 1
-            else:
-                failed_count += 1
+        sent_count, failed_count = processor.send_batch(pending_emails)
 
         processor.close()
 
@@ -428,12 +630,8 @@ def send_campaign_emails(campaign_id):
             flash('No pending emails to send.', 'info')
 
     except Exception as e:
+        logger.exception("Error sending emails for campaign %s", campaign_id)
         flash(f'Error sending emails: {e}', 'danger')
-        import traceback
-        traceback.print_exc()
-
-    finally:
-        session.close()
 
     return redirect(url_for('campaign_detail', campaign_id=campaign_id))
 
@@ -441,29 +639,32 @@ def send_campaign_emails(campaign_id):
 @app.route('/leads')
 def leads():
     """List leads"""
-    session = get_session()
-
-    try:
-        page = int(request.args.get('page', 1))
-        per_page = 50
-
-        query = session.query(SalesLead).filter(
-            SalesLead.is_deleted == False
-        ).order_by(SalesLead.created_at.desc())
+    session = ScopedSession()
 
-        total = query.count()
-        leads = query.offset((page - 1) * per_page).limit(per_page).all()
+    page = int(request.args.get('page', 1))
+    per_page = 50
 
-        return render_template(
-            'leads.html',
-            leads=leads,
-            page=page,
-            per_page=per_page,
-            total=total
+    query = session.query(SalesLead).options(
+        *_list_options(),
+        load_only(
+            SalesLead.id, SalesLead.company_name, SalesLead.first_name,
+            SalesLead.last_name, SalesLead.email, SalesLead.phone, SalesLead.city,
+            SalesLead.country, SalesLead.industry, SalesLead.source, SalesLead.created_at
         )
+    ).filter(
+        SalesLead.is_deleted == False
+    ).order_by(SalesLead.created_at.desc())
 
-    finally:
-        session.close()
+    total = query.count()
+    leads = query.offset((page - 1) * per_page).limit(per_page).all()
+
+    return render_template(
+        'leads.html',
+        leads=leads,
+        page=page,
+        per_page=per_page,
+        total=total
+    )
 
 
 @app.route('/leads/import', methods=['GET', 'POST'])
@@ -488,60 +689,108 @@ def import_leads():
             upload_dir = Path('data/uploads')
             upload_dir.mkdir(parents=True, exist_ok=True)
             
+            # Each upload gets its own file so concurrent imports can't overwrite
+            # or delete each other's input
             filename = secure_filename(file.filename)
-            filepath = upload_dir / filename
-            file.save(str(filepath))
-            
-            # Import leads
-            from scripts.import_csv_leads import import_csv_to_database
-            import logging
-            
-            # Set up logging to capture errors
-            logging.basicConfig(level=logging.INFO)
-            logger = logging.getLogger(__name__)
+            filepath = upload_dir / f'{uuid.uuid4().hex}_{filename}'
+            digest = hashlib.sha256()
+            _save_upload(file, filepath, hasher=digest)
             
             source_name = request.form.get('source_name', 'CSV Import')
             skip_duplicates = request.form.get('skip_duplicates') == 'on'
             
-            logger.info(f"Starting CSV import: file={filepath}, source={source_name}, skip_duplicates={skip_duplicates}")
+            # The content hash in the batch id makes re-uploads of the same file detectable
+            import_batch_id = f'csv_import_{Path(filename).stem[:60]}_{digest.hexdigest()[:16]}'
             
-            stats = import_csv_to_database(
-                filepath=str(filepath),
-                source_name=source_name,
-                skip_duplicates=skip_duplicates
-            )
+            # Only a notice: an earlier run may have stopped part way, and
+            # skip_duplicates already skips the leads it did import
+            if skip_duplicates and ScopedSession().query(LeadSource.id).filter(
+                LeadSource.import_batch_id == import_batch_id
+            ).first():
+                flash('This file was imported before; leads already in the database will be skipped.', 'info')
             
-            logger.info(f"Import completed: {stats}")
-            
-            if stats['errors'] > 0:
-                flash(f'Imported {stats["imported"]} leads, but {stats["errors"]} errors occurred. '
-                      f'({stats["skipped"]} skipped). Check server logs for details.', 'warning')
-            elif stats['imported'] == 0 and stats['total'] > 0:
-                flash(f'No leads imported. {stats["skipped"]} skipped, {stats["errors"]} errors. '
-                      f'Please check your CSV format and ensure it has an "email" column.', 'danger')
-            else:
-                flash(f'Successfully imported {stats["imported"]} leads! '
-                      f'({stats["skipped"]} skipped, {stats["errors"]} errors)', 'success')
-            
-            # Clean up uploaded file
-            if filepath.exists():
-                filepath.unlink()
+            # Import leads in the background; the status page polls for progress
+            job = submit_job(
+                'import_leads', _import_leads_job, filepath, source_name, skip_duplicates, import_batch_id,
+                next_url=url_for('leads')
+            )
             
-            return redirect(url_for('leads'))
+            return redirect(url_for('job_status', job_id=job.id))
             
         except Exception as e:
-            error_msg = str(e)
-            import traceback
-            error_details = traceback.format_exc()
-            logger.error(f"Import error: {error_msg}\n{error_details}")
-            flash(f'Error importing leads: {error_msg}. Check server logs for details.', 'danger')
+            flash(f'Error importing leads: {e}. Check server logs for details.', 'danger')
             return redirect(url_for('import_leads'))
     
     # GET: Show import form
     return render_template('import_leads.html')
 
 
+def _import_leads_job(
+    job: Job,
+    filepath: Path,
+    source_name: str,
+    skip_duplicates: bool,
+    import_batch_id: str
+) -> Dict[str, str]:
+    """Background part of import_leads; removes the uploaded file when done"""
+    from scripts.import_csv_leads import import_csv_to_database
+
+    logger.info("Starting CSV import: file=%s, source=%s, skip_duplicates=%s",
+                filepath, source_name, skip_duplicates)
+
+    try:
+        stats = import_csv_to_database(
+            filepath=str(filepath),
+            source_name=source_name,
+            skip_duplicates=skip_duplicates,
+            import_batch_id=import_batch_id,
+            progress=job.set_progress
+        )
+    finally:
+        # Clean up uploaded file
+        if filepath.exists():
+            filepath.unlink()
+
+    logger.info("Import completed: %s", stats)
+
+    if stats['errors'] > 0:
+        return {'category': 'warning',
+                'message': f'Imported {stats["imported"]} leads, but {stats["errors"]} errors occurred. '
+                           f'({stats["skipped"]} skipped). Check server logs for details.'}
+    elif stats['imported'] == 0 and stats['total'] > 0:
+        return {'category': 'danger',
+                'message': f'No leads imported. {stats["skipped"]} skipped, {stats["errors"]} errors. '
+                           f'Please check your CSV format and ensure it has an "email" column.'}
+    else:
+        return {'category': 'success',
+                'message': f'Successfully imported {stats["imported"]} leads! '
+                           f'({stats["skipped"]} skipped, {stats["errors"]} errors)'}
+
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Progress and outcome of a background job"""
+    job = get_job(job_id)
+
+    if not job:
+        flash('Job not found. It may have finished a while ago or the server was restarted.', 'warning')
+        return redirect(url_for('index'))
+
+    return render_template('job_status.html', job=job)
+
+
+@app.route('/jobs/<job_id>.json')
+def job_status_json(job_id):
+    """Job state as JSON; polled by the job status page"""
+    job = get_job(job_id)
+
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    return jsonify(job.to_dict())
+
+
 if __name__ == '__main__':
-    import os
+    logging.basicConfig(level=logging.INFO)
     port = int(os.environ.get('PORT', 8080))  # Default to 8080 to avoid macOS AirPlay conflict
     app.run(debug=True, host='0.0.0.0', port=port)
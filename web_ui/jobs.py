@@ -0,0 +1,121 @@
+"""
+In-process background jobs for web UI actions that outlast a request
+
+Jobs and their status live in this process only, so the app must run as a
+single process (threads are fine); with several Gunicorn workers a status
+page request can land on a worker that never saw the job.
+"""
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Jobs run at the same time; further jobs wait their turn
+MAX_WORKERS = 2
+
+# Most jobs remembered for the status page; the oldest finished jobs are
+# forgotten first, queued and running jobs are always kept
+MAX_TRACKED_JOBS = 200
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='web-job')
+_jobs: "OrderedDict[str, Job]" = OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+class Job:
+    """State of one background job, as shown on its status page"""
+
+    def __init__(self, kind: str, next_url: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.next_url = next_url  # Where to go once the job is done
+        self.status = 'queued'  # queued, running, finished, failed
+        self.progress: Dict[str, Any] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ('finished', 'failed')
+
+    def set_progress(self, progress: Dict[str, Any]):
+        """Record a snapshot of the job's progress counters"""
+        self.progress = dict(progress)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly snapshot of the job for status polling"""
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'done': self.done,
+            'progress': self.progress,
+            'result': self.result,
+            'error': self.error,
+            'next_url': self.next_url,
+            'created_at': self.created_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+def submit_job(
+    kind: str,
+    fn: Callable[..., Optional[Dict[str, Any]]],
+    *args,
+    next_url: Optional[str] = None,
+    **kwargs
+) -> Job:
+    """
+    Run fn(job, *args, **kwargs) on the background pool
+
+    fn runs outside the request, so it must open its own database session.
+    Its return value is stored as job.result.
+
+    Args:
+        kind: Short label for the job, e.g. 'import_leads'
+        fn: Job function; receives the Job first so it can report progress
+        next_url: Page to link to when the job is done
+
+    Returns:
+        The queued Job
+    """
+    job = Job(kind, next_url)
+
+    with _jobs_lock:
+        _jobs[job.id] = job
+        excess = len(_jobs) - MAX_TRACKED_JOBS
+        if excess > 0:
+            for old_id in [old.id for old in _jobs.values() if old.done][:excess]:
+                del _jobs[old_id]
+
+    _executor.submit(_run_job, job, fn, args, kwargs)
+    return job
+
+
+def get_job(job_id: str) -> Optional[Job]:
+    """Look up a job by id; None if unknown or already forgotten"""
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+
+def _run_job(job: Job, fn: Callable, args: tuple, kwargs: Dict[str, Any]):
+    """Run a job function and record its outcome on the Job"""
+    job.status = 'running'
+
+    # finished_at is set before status so a job never reads as done without it
+    try:
+        job.result = fn(job, *args, **kwargs)
+        job.finished_at = datetime.utcnow()
+        job.status = 'finished'
+    except Exception as e:
+        logger.exception("Background job %s (%s) failed", job.id, job.kind)
+        job.error = str(e)
+        job.finished_at = datetime.utcnow()
+        job.status = 'failed'